@@ -56,6 +56,26 @@ interface KnowledgeSource {
   page?: number;  // NEW: Page number if available
 }
 
+interface ReportResult {
+  success: boolean;
+  error?: string;
+  filename?: string;
+  format?: string;
+  email_sent?: boolean;
+  recipient?: string;
+}
+
+// /api/report/generate answers 202 with a job_id; poll its status until the report is done
+async function waitForReport(baseUrl: string, jobId: string): Promise<ReportResult> {
+  for (;;) {
+    const response = await fetch(`${baseUrl}/api/report/status/${jobId}`);
+    const job = await response.json();
+    if (job.result) return job.result as ReportResult;
+    if (job.error) throw new Error(job.error);
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+  }
+}
+
 export default function AssistantPage() {
   const [searchParams] = useSearchParams();
   const [analysis, setAnalysis] = useState<AnalysisSnapshot | null>(null);
@@ -269,9 +289,13 @@ export default function AssistantPage() {
         }),
       });
 
-      const data = await response.json();
+      const job = await response.json();
+      if (!response.ok || !job.job_id) {
+        throw new Error(job.error || `HTTP ${response.status}`);
+      }
+      const data = await waitForReport(unifiedConsoleUrl, job.job_id);
 
-      if (response.ok && data.filename) {
+      if (data.success && data.filename) {
         alert(
           `✅ Report generated successfully!\n\nFile: ${data.filename}\nFormat: ${data.format || "PDF"}\n${
             data.email_sent
@@ -780,6 +780,19 @@ function handleSSEEvent(data) {
             updateLLMStatus(eventData.model, 'error', eventData);
             break;
 
+        case 'ultra_start_progress':
+            // One line of ultra start progress
+            showMessage(eventData.line, 'info');
+            break;
+
+        case 'ultra_start_done':
+            // Final result is picked up by waitForUltraStart()
+            break;
+
+        case 'report_done':
+            // Report jobs are polled by the chat page (waitForReport)
+            break;
+
         case 'tep_data':
             // New TEP data point
             updateDataFlowDisplay(eventData);
@@ -1137,6 +1150,12 @@ function ultraStart() {
 
     fetch('/api/ultra_start', {method: 'POST'})
         .then(function(r) { return r.json(); })
+        .then(function(job) {
+            // Startup runs in the background; progress lines arrive over SSE,
+            // completion is polled from the job endpoint
+            if (!job.job_id) return job;
+            return waitForUltraStart(job.job_id);
+        })
         .then(function(data) {
             showMessage(data.message, data.success ? 'success' : 'error');
 
@@ -1161,6 +1180,26 @@ function ultraStart() {
         });
 }
 
+function waitForUltraStart(jobId) {
+    return new Promise(function(resolve, reject) {
+        function poll() {
+            fetch('/api/ultra_start/' + jobId)
+                .then(function(r) { return r.json(); })
+                .then(function(job) {
+                    if (job.result) {
+                        resolve(job.result);
+                    } else if (job.error) {
+                        reject(job.error);
+                    } else {
+                        setTimeout(poll, 1000);
+                    }
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}
+
 function loadLog(name) {
     console.log('loadLog() called with:', name);
     fetch('/api/logs/' + name)
@@ -267,8 +267,9 @@ function generateReport() {
         if (!r.ok) throw new Error('Report generation failed');
         return r.json();
     })
+    .then(job => waitForReport(job.job_id))
     .then(data => {
-        addChatMessage('assistant', '✅ Report generated successfully!\n\n📧 Sent to: ' + data.recipient + '\n📄 File: ' + data.filename);
+        addChatMessage('assistant', '✅ Report generated successfully!\n\n📧 Sent to: ' + data.recipient + '\n📄 File: ' + data.filename + '\n⬇️ Download: ' + data.download_url);
     })
     .catch(e => {
         addChatMessage('error', 'Failed to generate report: ' + e.message);
@@ -276,5 +277,30 @@ function generateReport() {
     });
 }
 
+// Report generation runs as a background job; poll until it has a result
+function waitForReport(jobId) {
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch('/api/report/status/' + jobId)
+                .then(r => r.json())
+                .then(job => {
+                    if (job.result) {
+                        if (job.result.success) {
+                            resolve(job.result);
+                        } else {
+                            reject(new Error(job.result.error || 'Report generation failed'));
+                        }
+                    } else if (job.error) {
+                        reject(new Error(job.error));
+                    } else {
+                        setTimeout(poll, 1000);
+                    }
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}
+
 console.log('✅ Interactive Chat JavaScript loaded');
 
@@ -0,0 +1,65 @@
+"""Smoke test: /stream must work when served by waitress (the default server in run())."""
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("flask")
+waitress = pytest.importorskip("waitress")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unified_console  # noqa: E402
+
+
+@pytest.fixture
+def panel(monkeypatch, tmp_path):
+    # Don't kill TEP processes of a running instance on the developer's machine
+    monkeypatch.setattr(unified_console.TEPDataBridge, "auto_cleanup_tep_processes", lambda self: None)
+    panel = unified_console.UnifiedControlPanel()
+    # Keep history, renames and report output away from the real backend/diagnostics data
+    panel._diag_dir = str(tmp_path)
+    panel._history_dir = str(tmp_path / "analysis_history")
+    panel._history_file = str(tmp_path / "analysis_history.jsonl")
+    panel._renames_file = str(tmp_path / "renames.jsonl")
+    return panel
+
+
+def test_stream_served_by_waitress(panel):
+    server = waitress.create_server(panel.app, host="127.0.0.1", port=0, threads=2)
+    port = server.effective_port
+    threading.Thread(target=server.run, daemon=True).start()
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"GET /stream HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n")
+            data = b""
+            while b"SSE stream established" not in data:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        head = data.split(b"\r\n\r\n", 1)[0].lower()
+        assert head.startswith(b"http/1.1 200"), data[:200]
+        assert b"content-type: text/event-stream" in head
+        assert b"SSE stream established" in data
+    finally:
+        server.close()
+
+
+def test_sse_client_cap():
+    sse = unified_console.SSEBroadcast(size=16, max_clients=2)
+    assert sse.subscribe() is not None
+    assert sse.subscribe() is not None
+    assert sse.subscribe() is None  # /stream answers 503 instead of taking a server thread
+    sse.unsubscribe()
+    assert sse.subscribe() is not None
+
+
+def test_listen_socket_sets_nodelay():
+    sock = unified_console.make_listen_socket("127.0.0.1", 0)
+    try:
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    finally:
+        sock.close()
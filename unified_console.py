@@ -14,15 +14,72 @@ import time
 import threading
 import subprocess
 import signal
+import webbrowser
+import atexit
+import traceback
+import platform
 import json
 import csv
 import re
-from collections import deque
+import mmap
+import shutil
+from datetime import datetime
+import mimetypes
+import socket
+import select
+import errno
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
 import numpy as np
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory, Response, stream_with_context
+from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory, send_file, Response, stream_with_context, abort
+from werkzeug.utils import safe_join
+from werkzeug.http import generate_etag
 from flask_cors import CORS
 import requests
-import queue
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # Optional: faster JSON encoding for SSE and polled endpoints
+except ImportError:
+    orjson = None
+
+try:
+    from flask.json.provider import DefaultJSONProvider  # Flask >= 2.2
+except ImportError:
+    DefaultJSONProvider = None
+
+try:
+    import pandas as pd  # Loaded once at startup; used by the baseline reload handler
+except ImportError:
+    pd = None
+
+# Signals that trigger a graceful shutdown (SIGHUP doesn't exist on Windows)
+SHUTDOWN_SIGNALS = {signal.SIGINT, signal.SIGTERM} | ({signal.SIGHUP} if hasattr(signal, 'SIGHUP') else set())
+
+# Rename-log records after which rename_snapshot folds them into the history file
+RENAME_COMPACT_LINES = 1000
+
+# Seconds a proxied /api/models/status answer is reused before asking the backend again
+MODELS_STATUS_TTL = 0.75
+
+# Concurrent /stream clients; each holds a server thread until its connection drops
+# (a vanished client is only noticed at the next heartbeat write)
+SSE_MAX_CLIENTS = 8
+
+# Worker threads for the production WSGI server: 16 for API calls plus one per SSE client,
+# so open dashboards can never starve the API routes
+WSGI_THREADS = 16 + SSE_MAX_CLIENTS
+
+# Diagnostics logs that /api/logs/<name> may serve
+ALLOWED_LOGS = frozenset({'sse', 'ingest'})
+# Per-day history file names (YYYY-MM-DD)
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+# Reports written by backend/report_generator.py into backend/diagnostics
+REPORT_NAME_RE = re.compile(r'^RCA_Report_[\w.-]+\.(pdf|md)$')
+# The backend writes each history line as json.dumps({"id": <int>, ...}), so the id is a fixed prefix
+HISTORY_ID_RE = re.compile(rb'\{"id":\s*(-?\d+)[,}]')
 
 # --- Helpers: resolve tools cross-platform and venv-aware ---
 
@@ -45,6 +102,294 @@ def resolve_venv_python():
 def resolve_npm_cmd():
     return 'npm.cmd' if sys.platform.startswith('win') else 'npm'
 
+
+def _json_default(value):
+    """JSON fallback for numpy arrays/scalars and other non-native values."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def json_dumps_bytes(obj):
+        """Serialize to JSON bytes (orjson)."""
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+else:
+    def json_dumps_bytes(obj):
+        """Serialize to JSON bytes (stdlib fallback)."""
+        return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+if orjson is not None and DefaultJSONProvider is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Route jsonify() through orjson; request parsing stays on the stdlib provider."""
+
+        def dumps(self, obj, **kwargs):
+            return json_dumps_bytes(obj).decode('utf-8')
+else:
+    OrjsonProvider = None
+
+
+def json_response(obj, status=200):
+    """Flask response from pre-encoded JSON bytes, bypassing jsonify."""
+    return Response(json_dumps_bytes(obj), status=status, mimetype='application/json')
+
+
+def passthrough_response(r):
+    """Relay a backend `requests` response body as-is, skipping a JSON parse/re-encode round trip."""
+    return Response(r.content, status=r.status_code,
+                    content_type=r.headers.get('Content-Type', 'application/json'))
+
+
+def stream_passthrough_response(r, chunk_size=8192, keep_headers=('content-type',)):
+    """Relay a `stream=True` backend response chunk by chunk; the connection goes back to the pool when done."""
+    headers = {k: v for k, v in r.headers.items() if k.lower() in keep_headers}
+    if 'Content-Length' in r.headers and 'Content-Encoding' not in r.headers:
+        # iter_content decodes gzip, so only a plain body keeps its length
+        headers['Content-Length'] = r.headers['Content-Length']
+
+    def relay():
+        try:
+            yield from r.iter_content(chunk_size=chunk_size)
+        finally:
+            r.close()
+
+    return Response(stream_with_context(relay()), status=r.status_code, headers=headers)
+
+
+def encode_sse_event(event):
+    """Encode an event dict as a complete SSE `data:` frame (bytes)."""
+    return b"data: " + json_dumps_bytes(event) + b"\n\n"
+
+
+def measurement_vector(data_point):
+    """Pack a data point's XMEAS_*/XMV_* values into a float64 vector in a stable key order."""
+    return np.fromiter(
+        (v for k, v in sorted(data_point.items()) if k.startswith(('XMEAS_', 'XMV_'))),
+        dtype=np.float64
+    )
+
+
+def make_backend_session(pool_maxsize=64, retries=True):
+    """requests.Session with a keep-alive connection pool for calls to the local backend.
+    retries=False makes every failure surface immediately (no retry of any kind).
+    """
+    session = requests.Session()
+    # Retry only connection setup (backend restarting); never re-send after a read timeout,
+    # which would multiply a slow backend's timeout on a server worker thread
+    max_retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1) if retries else 0
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=max_retries)
+    session.mount('http://', adapter)
+    return session
+
+
+def port_is_open(host, port, timeout=1.0):
+    """Non-blocking TCP connect probe: True if something is listening on host:port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setblocking(False)
+        err = sock.connect_ex((host, port))
+        if err == 0:
+            return True
+        if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            return False
+        _, writable, _ = select.select([], [sock], [], timeout)
+        return bool(writable) and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+    finally:
+        sock.close()
+
+
+def make_listen_socket(host, port, backlog=128):
+    """Bind and listen on host:port with SO_REUSEADDR so a restart binds despite TIME_WAIT connections.
+
+    No SO_REUSEPORT (nor SO_REUSEADDR on Windows, where it means the same): either would let
+    a second console bind the port silently and split requests and SSE clients with this one.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name == 'posix':
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # SSE frames are small and latency-sensitive: no Nagle delay. Accepted connections
+        # inherit this on Linux/BSD, whichever server (waitress, werkzeug) owns the socket
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def wait_port_free(host, port, max_ms=500):
+    """Poll every 10 ms until host:port can be bound again (e.g. after killing its owner); False on timeout."""
+    deadline = time.monotonic() + max_ms / 1000
+    while True:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Same option the WSGI servers set, so leftover TIME_WAIT connections don't count as busy
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((host, port))
+            return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        finally:
+            sock.close()
+
+
+CHILD_LOG_CHECK_INTERVAL = 30.0  # seconds between size checks of running children's logs
+_child_logs = {}  # path -> max_bytes, for every log handed to a child process
+_child_logs_lock = threading.Lock()
+_child_log_watcher = None
+
+
+def rotate_child_log(path, max_bytes):
+    """Copy path to `.1` and truncate it in place if it exceeds max_bytes.
+
+    Copy-and-truncate rather than rename: the child keeps writing to its inherited
+    descriptor, and since that is opened with O_APPEND its next write lands at the
+    start of the truncated file. Lines written between the copy and the truncate are lost.
+    """
+    try:
+        if os.path.getsize(path) <= max_bytes:
+            return False
+        shutil.copyfile(path, path + '.1')
+        os.truncate(path, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _watch_child_logs(interval=CHILD_LOG_CHECK_INTERVAL):
+    while True:
+        time.sleep(interval)
+        with _child_logs_lock:
+            logs = list(_child_logs.items())
+        for path, max_bytes in logs:
+            rotate_child_log(path, max_bytes)
+
+
+def open_child_log(path, max_bytes=1_000_000):
+    """Open a child-process log file for appending, capped at about max_bytes (plus one `.1` backup).
+
+    Child stdout/stderr go here instead of the console TTY so a slow terminal
+    can never stall the child on write(). The size is checked at spawn and then every
+    CHILD_LOG_CHECK_INTERVAL seconds by a daemon thread, so a long-running child
+    can't grow the file without bound.
+    """
+    global _child_log_watcher
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rotate_child_log(path, max_bytes)
+    with _child_logs_lock:
+        _child_logs[path] = max_bytes
+        if _child_log_watcher is None:
+            _child_log_watcher = threading.Thread(target=_watch_child_logs, name='child-log-rotate', daemon=True)
+            _child_log_watcher.start()
+    return open(path, 'ab')
+
+
+def tail_lines(path, n=200, block=64 * 1024):
+    """Return the last n lines of a file (newlines kept, like readlines()).
+
+    Reads fixed-size blocks backwards in binary and decodes only the bytes that
+    make up the returned lines, so the cost doesn't grow with the file.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        # n lines need n newlines before them (plus one that may end the file)
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines(keepends=True)[-n:]
+    return [line.decode('utf-8', errors='replace') for line in lines]
+
+
+def read_log_tail(path, max_chars=200):
+    """Return the last max_chars of a child log file (used for startup error messages)."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - max_chars))
+            return f.read().decode('utf-8', errors='replace').strip()
+    except OSError:
+        return ""
+
+class SpawnedProcess:
+    """Minimal Popen-compatible handle (poll/wait/terminate/kill) for a pid from os.posix_spawn."""
+
+    def __init__(self, pid, args):
+        self.pid = pid
+        self.args = args
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                # Already reaped elsewhere; match Popen and report a clean exit
+                self.returncode = 0
+            else:
+                if pid != 0:
+                    self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+def spawn_detached(argv, cwd, log_file):
+    """Start argv in its own session with stdout/stderr on log_file.
+
+    Uses os.posix_spawn (vfork-style, no page-table copy of this process) when the
+    platform has it and cwd is already the working directory, since posix_spawn
+    cannot chdir; otherwise falls back to subprocess.Popen.
+    """
+    if hasattr(os, 'posix_spawn') and os.path.realpath(os.getcwd()) == os.path.realpath(cwd):
+        fd = log_file.fileno()
+        pid = os.posix_spawn(
+            argv[0], argv, os.environ,
+            file_actions=[(os.POSIX_SPAWN_DUP2, fd, 1), (os.POSIX_SPAWN_DUP2, fd, 2)],
+            setsid=True
+        )
+        return SpawnedProcess(pid, argv)
+    return subprocess.Popen(
+        argv,
+        cwd=cwd,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        start_new_session=True  # Detach from parent
+    )
+
+
 class TEPDataBridge:
     """Bridge between dynamic TEP simulation and FaultExplainer."""
 
@@ -58,10 +403,13 @@ class TEPDataBridge:
         self.current_step = 0
         self.idv_values = np.zeros(20)  # 20 IDV inputs (binary for Fortran)
         self.idv_continuous_values = np.zeros(20)  # Store continuous values for future use
+        # (array, list, active_faults) caches; dropped when set_idv/set_xmv mutate in place,
+        # and ignored if the array object itself gets replaced
+        self._idv_state_cache = None
+        self._xmv_list_cache = None
         # Maintain a time-series of IDV rows so the simulator advances over time
         # Rather than simulating a single step repeatedly (which yields a constant output)
-        from collections import deque as _deque
-        self.idv_history = _deque(maxlen=1200)  # ~1 day of 3-min steps
+        self.idv_history = deque(maxlen=1200)  # ~1 day of 3-min steps
 
         # Keep persistent simulation instance to avoid re-running entire history
         self.tep_sim_instance = None
@@ -82,6 +430,8 @@ class TEPDataBridge:
         self.stability_window = 20  # Monitor last 20 points for stability
         self.stability_threshold = 0.05  # 5% coefficient of variation threshold
         self.is_stable = False
+        # Bumped whenever training/stability state changes so /api/pca/status can reuse its last body
+        self.pca_gen = 0
 
         # Timing control
         self.last_pca_time = 0
@@ -244,12 +594,14 @@ class TEPDataBridge:
             # Check if we're in Anomaly Detection training mode
             if self.pca_training_mode:
                 self.pca_training_data.append(mapped)
+                self.pca_gen += 1
                 print(f"📊 Anomaly Detection Training: Collected {len(self.pca_training_data)}/{self.pca_training_target} data points")
 
                 if len(self.pca_training_data) >= self.pca_training_target:
                     print("🎯 Anomaly Detection Training: Target reached, retraining model...")
                     self.retrain_pca_model()
                     self.pca_training_mode = False
+                    self.pca_gen += 1
                     print("✅ Anomaly Detection Training: Complete, resuming normal operation")
 
                 # Don't send to ingest during training - just record heartbeat
@@ -258,7 +610,6 @@ class TEPDataBridge:
                 self.last_ingest_info = {"status": "training", "collected": len(self.pca_training_data)}
                 return
 
-            import requests
             r = requests.post(url, json={"data_point": mapped}, timeout=60)
             self.last_ingest_at = time.time()
             if r.status_code == 404:
@@ -300,7 +651,6 @@ class TEPDataBridge:
         """Retrain Anomaly Detection model by merging new stable data with original baseline."""
         try:
             import pandas as pd
-            import requests
 
             # Load original baseline data from local backend (500 points)
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -359,15 +709,19 @@ class TEPDataBridge:
                 self.stability_buffer.pop(0)
 
             # Check stability if we have enough points
+            stable = False
             if len(self.stability_buffer) >= self.stability_window:
-                import numpy as np
                 values = np.array(self.stability_buffer)
                 mean_val = np.mean(values)
                 std_val = np.std(values)
                 cv = std_val / mean_val if mean_val != 0 else 1.0
 
                 self.is_stable = bool(cv < self.stability_threshold)
-                return self.is_stable
+                stable = self.is_stable
+
+            # Bump after the state update so a cached status built for this gen sees it
+            self.pca_gen += 1
+            return stable
 
         return False
 
@@ -375,6 +729,7 @@ class TEPDataBridge:
         """Start Anomaly Detection training mode."""
         self.pca_training_mode = True
         self.pca_training_data = []
+        self.pca_gen += 1
         print(f"🎯 Anomaly Detection Training: Started, will collect {self.pca_training_target} stable data points")
 
     def set_idv(self, idv_num, value):
@@ -392,6 +747,7 @@ class TEPDataBridge:
                     self.idv_values[idv_num - 1] = 1.0
                 else:
                     self.idv_values[idv_num - 1] = 0.0
+                self._idv_state_cache = None
 
                 if float_value == 0:
                     status = "NORMAL"
@@ -414,10 +770,31 @@ class TEPDataBridge:
                     self.xmv_values = np.array([63.0, 53.0, 24.0, 61.0, 22.0, 40.0, 38.0, 46.0, 47.0, 41.0, 18.0])
 
                 self.xmv_values[xmv_num - 1] = float_value
+                self._xmv_list_cache = None
                 print(f"🎛️ Set XMV_{xmv_num} = {float_value:.1f}%")
                 return True
         return False
 
+    def idv_state(self):
+        """Return (idv_list, active_faults) for the current IDV vector, cached until it changes."""
+        cache = self._idv_state_cache
+        if cache is None or cache[0] is not self.idv_values:
+            idv = self.idv_values
+            cache = (idv, idv.tolist(), (np.flatnonzero(idv == 1) + 1).tolist())
+            self._idv_state_cache = cache
+        return cache[1], cache[2]
+
+    def xmv_list(self):
+        """Return the current XMV vector as a list (None before any XMV was set), cached until it changes."""
+        xmv = getattr(self, 'xmv_values', None)
+        if xmv is None:
+            return None
+        cache = self._xmv_list_cache
+        if cache is None or cache[0] is not xmv:
+            cache = (xmv, xmv.tolist())
+            self._xmv_list_cache = cache
+        return cache[1]
+
     def set_setpoint(self, setpoint_num, value):
         """Set control setpoint value - CRITICAL MISSING METHOD!
 
@@ -460,17 +837,15 @@ class TEPDataBridge:
 
             # REAL TEP SIMULATION: Always run fresh simulation with current history
             # This ensures we get genuine dynamic data, not artificial stability
-            import numpy as _np2
-
             # Create simulation matrix with current IDV history
             # Include some pre-run steps for stability, then actual history
             prerun_steps = 10  # Reduced for faster simulation
-            prerun_matrix = _np2.zeros((prerun_steps, 20), dtype=_np2.float64)  # No faults during pre-run
+            prerun_matrix = np.zeros((prerun_steps, 20), dtype=np.float64)  # No faults during pre-run
 
             # Convert IDV history to proper format (FLOAT, not INT!)
             if len(self.idv_history) > 0:
-                actual_matrix = _np2.array(list(self.idv_history), dtype=_np2.float64).reshape(-1, 20)
-                full_matrix = _np2.vstack([prerun_matrix, actual_matrix])
+                actual_matrix = np.array(list(self.idv_history), dtype=np.float64).reshape(-1, 20)
+                full_matrix = np.vstack([prerun_matrix, actual_matrix])
             else:
                 # If no history yet, just use prerun matrix
                 full_matrix = prerun_matrix
@@ -753,42 +1128,40 @@ class TEPDataBridge:
             temp_sim = self.tep2py.tep2py(idv_matrix, speed_factor=1.0)  # Use normal speed for stability
             temp_sim.simulate()
 
-            if hasattr(temp_sim, 'process_data'):
+            try:
                 data = temp_sim.process_data
+            except AttributeError:
+                print("   ❌ No data from pre-run simulation")
+                return False
 
-                # Check if we reached steady state
-                if len(data) >= 20:
-                    # Analyze last 5 steps for stability
-                    reactor_pressure = data['XMEAS(7)'].values[-5:]
-                    reactor_temp = data['XMEAS(9)'].values[-5:]
+            # Check if we reached steady state
+            if len(data) < 20:
+                print("   ⚠️ Insufficient data from pre-run")
+                return False
 
-                    pressure_std = np.std(reactor_pressure)
-                    temp_std = np.std(reactor_temp)
+            # Analyze last 5 steps for stability: one ndarray view, two reductions
+            last = data[['XMEAS(7)', 'XMEAS(9)']].to_numpy(copy=False)[-5:]
+            pressure_mean, temp_mean = last.mean(axis=0)
+            pressure_std, temp_std = last.std(axis=0)
 
-                    print(f"   📊 Steady state check:")
-                    print(f"      Reactor Pressure: {np.mean(reactor_pressure):.1f} ± {pressure_std:.1f} kPa")
-                    print(f"      Reactor Temperature: {np.mean(reactor_temp):.1f} ± {temp_std:.1f} °C")
+            print(f"   📊 Steady state check:")
+            print(f"      Reactor Pressure: {pressure_mean:.1f} ± {pressure_std:.1f} kPa")
+            print(f"      Reactor Temperature: {temp_mean:.1f} ± {temp_std:.1f} °C")
 
-                    # Consider steady if standard deviation is small
-                    if pressure_std < 10 and temp_std < 1.0:
-                        print("   ✅ Steady state achieved!")
+            # Consider steady if standard deviation is small
+            if pressure_std < 10 and temp_std < 1.0:
+                print("   ✅ Steady state achieved!")
 
-                        # Store steady state values for reference
-                        self.steady_state_values = {
-                            'pressure': np.mean(reactor_pressure),
-                            'temperature': np.mean(reactor_temp),
-                            'achieved_at_step': prerun_steps
-                        }
-                        return True
-                    else:
-                        print("   ⚠️ Still not fully steady, but proceeding...")
-                        return True  # Proceed anyway, it's better than starting from scratch
-                else:
-                    print("   ⚠️ Insufficient data from pre-run")
-                    return False
+                # Store steady state values for reference
+                self.steady_state_values = {
+                    'pressure': pressure_mean,
+                    'temperature': temp_mean,
+                    'achieved_at_step': prerun_steps
+                }
+                return True
             else:
-                print("   ❌ No data from pre-run simulation")
-                return False
+                print("   ⚠️ Still not fully steady, but proceeding...")
+                return True  # Proceed anyway, it's better than starting from scratch
 
         except Exception as e:
             print(f"   ❌ Pre-run failed: {e}")
@@ -826,6 +1199,56 @@ class TEPDataBridge:
                 pass
         return False
 
+    def kill_port_processes(self, ports):
+        """SIGKILL every process bound to one of the given ports; returns the killed PIDs.
+
+        One psutil.net_connections() sweep covers all ports; falls back to a
+        single lsof when psutil is missing or the sweep needs privileges (macOS).
+        """
+        targets = set(ports)
+        pids = set()
+        sweep_error = None
+        try:
+            import psutil
+        except ImportError as e:
+            psutil = None
+            sweep_error = e
+        else:
+            try:
+                for conn in psutil.net_connections(kind='inet'):
+                    if conn.pid and conn.laddr and conn.laddr.port in targets:
+                        pids.add(conn.pid)
+            except (psutil.Error, OSError) as e:
+                # psutil.AccessDenied (macOS without root) derives from psutil.Error, not OSError
+                sweep_error = e
+
+        if sweep_error is not None:
+            lsof_cmd = ['lsof', '-t', '-sTCP:LISTEN']
+            for port in ports:
+                lsof_cmd += ['-i', f':{port}']  # repeated -i flags are OR'ed
+            try:
+                result = subprocess.run(lsof_cmd, capture_output=True, text=True, timeout=3)
+                pids = {int(pid) for pid in result.stdout.split()}
+            except Exception:
+                print(f"⚠️ Could not list port owners: {sweep_error}")
+                return []
+
+        pids.discard(os.getpid())  # Never kill the console itself
+        killed = []
+        # NoSuchProcess/AccessDenied derive from psutil.Error, not OSError
+        kill_errors = (OSError, psutil.Error) if psutil is not None else (OSError,)
+        for pid in pids:
+            try:
+                if psutil is not None:
+                    psutil.Process(pid).kill()  # TerminateProcess on Windows, SIGKILL elsewhere
+                else:
+                    # Without psutil we only get here via lsof, i.e. on POSIX
+                    os.kill(pid, signal.SIGKILL)
+                killed.append(pid)
+            except kill_errors:
+                pass
+        return killed
+
     def start_faultexplainer_backend(self):
         """Start FaultExplainer backend."""
         try:
@@ -847,23 +1270,28 @@ class TEPDataBridge:
 
             print(f"🚀 Starting backend: {venv_python} app.py in {backend_path}")
 
-            process = subprocess.Popen(
-                [venv_python, 'app.py'],
-                cwd=backend_path,
-                stdout=None,
-                stderr=None,
-                env=dict(os.environ, PYTHONPATH=backend_path)
-            )
+            # Send uvicorn output to a log file rather than inheriting the console TTY
+            backend_log = os.path.join(backend_path, 'logs', 'backend_console.log')
+            log_file = open_child_log(backend_log)
+            try:
+                process = subprocess.Popen(
+                    [venv_python, 'app.py'],
+                    cwd=backend_path,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=dict(os.environ, PYTHONPATH=backend_path)
+                )
+            finally:
+                log_file.close()  # Child keeps its own copy of the descriptor
 
             # Wait a moment and check if process started successfully
             time.sleep(2)
             if process.poll() is None:
                 self.processes['faultexplainer_backend'] = process
-                print("✅ Backend process started successfully")
+                print(f"✅ Backend process started successfully (logs: {backend_log})")
                 return True, "FaultExplainer backend started on port 8000"
             else:
-                stdout, stderr = process.communicate()
-                error_msg = stdout.decode() if stdout else "Unknown error"
+                error_msg = read_log_tail(backend_log) or "Unknown error"
                 print(f"❌ Backend failed to start: {error_msg}")
                 return False, f"Backend failed to start: {error_msg[:100]}"
 
@@ -885,13 +1313,18 @@ class TEPDataBridge:
             time.sleep(1)
             venv_python = resolve_venv_python()
             print(f"🚀 Starting backend (dev reload): {venv_python} -m uvicorn app:app --reload")
-            process = subprocess.Popen(
-                [venv_python, '-m', 'uvicorn', 'app:app', '--host', '0.0.0.0', '--port', '8000', '--reload'],
-                cwd=backend_path,
-                stdout=None,
-                stderr=None,
-                env=dict(os.environ, PYTHONPATH=backend_path)
-            )
+            backend_log = os.path.join(backend_path, 'logs', 'backend_console.log')
+            log_file = open_child_log(backend_log)
+            try:
+                process = subprocess.Popen(
+                    [venv_python, '-m', 'uvicorn', 'app:app', '--host', '0.0.0.0', '--port', '8000', '--reload'],
+                    cwd=backend_path,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=dict(os.environ, PYTHONPATH=backend_path)
+                )
+            finally:
+                log_file.close()
             time.sleep(2)
             if process.poll() is None:
                 self.processes['faultexplainer_backend'] = process
@@ -1002,7 +1435,6 @@ class TEPDataBridge:
                         self.processes['faultexplainer_frontend'] = process
                         print("✅ Frontend process started successfully")
                         try:
-                            import webbrowser
                             webbrowser.open('http://127.0.0.1:5173')
                         except Exception:
                             pass
@@ -1080,13 +1512,20 @@ class TEPDataBridge:
         print("✅ TEP simulation stopped")
 
         # Stop all tracked processes (but don't clear the dict!)
-        for name, process in list(self.processes.items()):
+        # Send SIGTERM to every child first so they all share one 3-second grace window
+        tracked = list(self.processes.items())
+        for name, process in tracked:
             try:
                 print(f"🔪 Terminating {name} (PID: {process.pid})")
                 process.terminate()
-                # Wait up to 3 seconds for graceful shutdown
+            except Exception as e:
+                print(f"⚠️ Error stopping {name}: {e}")
+
+        deadline = time.monotonic() + 3
+        for name, process in tracked:
+            try:
                 try:
-                    process.wait(timeout=3)
+                    process.wait(timeout=max(0, deadline - time.monotonic()))
                     print(f"✅ {name} terminated gracefully")
                 except subprocess.TimeoutExpired:
                     print(f"💀 Force killing {name}")
@@ -1094,7 +1533,7 @@ class TEPDataBridge:
                     process.wait()
 
                 # Remove terminated process from dict
-                del self.processes[name]
+                self.processes.pop(name, None)
 
             except Exception as e:
                 print(f"⚠️ Error stopping {name}: {e}")
@@ -1132,7 +1571,6 @@ class TEPDataBridge:
         backend_buf = None
         backend_reachable = False
         try:
-            import requests
             # Check backend status endpoint
             try:
                 r = requests.get('http://127.0.0.1:8000/api/status', timeout=1.5)
@@ -1184,7 +1622,7 @@ class TEPDataBridge:
             'backend_running': backend_running_flag,
             'frontend_running': self.check_process_status('faultexplainer_frontend'),
             'bridge_running': self.check_process_status('tep_bridge'),
-            'idv_values': self.idv_values.tolist(),
+            'idv_values': self.idv_state()[0],
             'latest_data': latest_data  # Add this for DisturbanceEffectsPage
         }
 
@@ -1257,21 +1695,205 @@ class TEPDataBridge:
 
         return health
 
+# Keep-alive comment line; one shared bytes object published to every SSE client
+SSE_HEARTBEAT = b": heartbeat\n\n"
+
+
+class SSEBroadcast:
+    """Ring buffer for SSE fan-out: one shared buffer, one read cursor per client.
+
+    Publishing writes the encoded frame into the next slot and bumps a sequence
+    number; consumers never take a lock, they just read slots between their
+    cursor and the write sequence. A client that falls a full buffer behind is
+    reported as lagged so its stream can be closed.
+    """
+
+    def __init__(self, size=4096, max_clients=None):
+        if size & (size - 1):
+            raise ValueError("SSEBroadcast size must be a power of two")
+        self._size = size
+        self._mask = size - 1
+        self._buf = [None] * size
+        self.write_seq = 0
+        self._new_data = threading.Event()
+        self._publish_lock = threading.Lock()  # Only serializes concurrent producers
+        self.client_count = 0
+        self.max_clients = max_clients
+
+    def publish(self, frame):
+        """Append one encoded frame and wake every waiting consumer."""
+        with self._publish_lock:
+            self._buf[self.write_seq & self._mask] = frame
+            self.write_seq += 1
+            # Swap in a fresh event before waking the current waiters
+            woken, self._new_data = self._new_data, threading.Event()
+        woken.set()
+
+    def start_heartbeat(self, interval=30):
+        """Publish one shared heartbeat comment every interval seconds for all clients."""
+        def beat():
+            while True:
+                time.sleep(interval)
+                self.publish(SSE_HEARTBEAT)
+        threading.Thread(target=beat, daemon=True).start()
+
+    def subscribe(self):
+        """Register a client; returns its starting cursor (only new frames are delivered),
+        or None when max_clients are already connected.
+        """
+        with self._publish_lock:
+            if self.max_clients is not None and self.client_count >= self.max_clients:
+                return None
+            self.client_count += 1
+            return self.write_seq
+
+    def unsubscribe(self):
+        with self._publish_lock:
+            self.client_count -= 1
+
+    def read(self, cursor, timeout=None):
+        """Return (frames, new_cursor); frames is [] on timeout and None if the client lagged."""
+        new_data = self._new_data
+        if cursor == self.write_seq:
+            new_data.wait(timeout)
+        end = self.write_seq
+        if end - cursor > self._size:
+            return None, end
+        frames = [self._buf[seq & self._mask] for seq in range(cursor, end)]
+        # Slots may have been overwritten while copying if the producer lapped us
+        if self.write_seq - cursor > self._size:
+            return None, self.write_seq
+        return frames, end
+
+
+# Physical explanations served by /api/idv/explain/<n>
+IDV_EXPLANATIONS = {
+    1: {
+        "name": "A/C Feed Ratio Change (Stream 4)",
+        "physical_meaning": "Changes the composition ratio of components A and C in the feed stream while keeping B constant",
+        "what_happens": "Component A decreases by 3% (48.5% → 45.5%), Component C increases by 3% (51.0% → 54.0%)",
+        "industrial_cause": "Feed preparation system malfunction, upstream process changes, feed tank mixing issues, or flow meter calibration drift",
+        "expected_behavior": {
+            "immediate": "Feed composition changes instantly (step change)",
+            "reactor": "Reaction kinetics change due to different A/C ratio",
+            "product": "Product quality affected - less A means lower conversion",
+            "control": "Controllers detect composition change and try to compensate by adjusting flow rates"
+        },
+        "measurements_affected": {
+            "primary": ["XMEAS(23-41): Composition measurements", "XMEAS(6): Reactor feed rate"],
+            "secondary": ["XMEAS(9): Reactor temperature", "XMEAS(7): Reactor pressure"]
+        },
+        "operator_expectations": {
+            "composition_analyzer": "Should show A component dropping from ~48.5% to ~45.5%",
+            "reactor_temperature": "May increase slightly due to different reaction heat",
+            "product_quality": "Product purity may decrease due to lower A conversion",
+            "control_response": "Feed flow controllers will adjust to maintain production rate"
+        },
+        "detection_difficulty": "Easy (95-99% detection rate)",
+        "severity": "Medium - affects product quality but process remains stable",
+        "fortran_implementation": "XST(1,4) = TESUB8(1,TIME) - IDV(1)*0.03D0"
+    }
+}
+# Encoded once; the explain endpoint only looks bytes up
+IDV_EXPLANATIONS_JSON = {k: json_dumps_bytes(v) for k, v in IDV_EXPLANATIONS.items()}
+
+
 class UnifiedControlPanel:
     """Unified control panel for TEP system."""
 
+    # IDVs each Level 2 process adjustment may drive
+    _COMPOSITION_IDVS = frozenset({1, 2})  # A/C Feed Ratio, B Composition
+    _TEMPERATURE_IDVS = frozenset({4, 5})  # Reactor / condenser cooling water
+    _FLOW_IDVS = frozenset({6, 7})         # A Feed Loss, C Header Pressure Loss
+
     def __init__(self):
         self.app = Flask(__name__)
+        if OrjsonProvider is not None:
+            self.app.json = OrjsonProvider(self.app)
 
         # Enable CORS for React frontend (port 5173)
         CORS(self.app, resources={r"/api/*": {"origins": ["http://localhost:5173", "http://127.0.0.1:5173"]}})
 
         self.bridge = TEPDataBridge()
         self.baseline_data = None  # Will be loaded when user clicks "Load Baseline"
+        self._baseline_key = None  # (mtime_ns, size) of the CSV behind baseline_data
+        self._baseline_summary = None
 
         # SSE (Server-Sent Events) support for real-time updates
-        self.sse_queues = []  # List of queues for multiple clients
-        self.sse_lock = threading.Lock()  # Thread-safe queue management
+        # Shared ring buffer, one read cursor per client. Slots hold references to the
+        # same encoded bytes, so a deep buffer costs only pointers.
+        self.sse = SSEBroadcast(size=16384, max_clients=SSE_MAX_CLIENTS)
+        self.sse.start_heartbeat(30)  # One timer for all clients instead of a timeout per client
+        # Fixed-shape IDV buffers for /api/idv/test (read-only baseline + reusable scratch)
+        self._idv_zero = np.zeros(20, dtype=np.float64)
+        self._idv_zero.flags.writeable = False
+        self._idv_scratch = np.zeros(20, dtype=np.float64)
+
+        # Analysis history (appended by the backend): byte-offset index so snapshot
+        # lookups don't re-read and re-parse the whole JSONL file on every request
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self._script_dir = script_dir
+        self._backend_dir = os.path.join(script_dir, 'backend')
+        self._venv_python = os.path.join(script_dir, '.venv', 'bin', 'python')
+        self._baseline_path = os.path.join(self._backend_dir, 'data', 'normal_baseline.csv')
+        self._diag_dir = os.path.join(self._backend_dir, 'diagnostics')
+        # Backend modules (report_generator, email_sender) are imported lazily from here
+        if self._backend_dir not in sys.path:
+            sys.path.insert(0, self._backend_dir)
+        self._history_dir = os.path.join(self._diag_dir, 'analysis_history')  # per-day Markdown
+        self._history_file = os.path.join(self._diag_dir, 'analysis_history.jsonl')
+        self._history_lock = threading.Lock()
+        self._history_index = {}  # snapshot id -> (offset, length)
+        self._history_size = 0  # bytes indexed so far (end of last complete line)
+        self._history_mtime = 0
+        self._history_tail = deque(maxlen=500)  # metadata of the most recent snapshots
+        self._history_mmap = None
+        self._snapshot_lru = OrderedDict()  # snapshot id -> parsed record (before rename overlay)
+        # Renames are appended to a sidecar log and overlaid on read instead of rewriting the history
+        self._renames_file = os.path.join(self._diag_dir, 'renames.jsonl')
+        self._rename_overlay = {}  # snapshot id -> {'name', 'tags', 'last_modified'}
+        self._renames_size = 0
+        self._renames_lines = 0  # records in the rename log since the last compaction
+        self._rename_fd = None  # O_APPEND fd, opened on first rename
+        self._rename_sync_pending = False  # fsync batched by a 1 s timer
+        # Folding renames into the history is a maintenance step (_compact_renames), run from
+        # run() at startup - never from here, so merely building a panel doesn't rewrite data
+
+        # Shared keep-alive pool for proxy calls to the FaultExplainer backend on :8000
+        self._backend_session = make_backend_session()
+        # The polled models status/toggle proxies never retry: one slow call must not hold
+        # the status cache lock (and the pollers behind it) for several timeouts
+        self._models_session = make_backend_session(pool_maxsize=8, retries=False)
+
+        # Background jobs for long-running actions (e.g. ultra start) so request threads return at once
+        self._jobs = {}  # job_id -> {'status', 'result'}; finished jobs beyond the latest 20 are dropped
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._browser_timer = None  # Deferred auto-open from run()
+        self._shutting_down = threading.Event()  # Set by the first termination signal
+        self._cleanup_lock = threading.RLock()
+        self._cleaned = False  # cleanup_on_exit has run (signal, atexit or whichever came first)
+
+        # Short-TTL cache of encoded bodies for endpoints the UI polls (/api/status etc.)
+        self._response_cache = {}  # key -> (monotonic timestamp, JSON bytes)
+        self._response_cache_locks = {}
+        self.debug_status_log = os.environ.get('TEP_DEBUG_STATUS_LOG') == '1'
+        self._pca_cache = None  # (bridge.pca_gen, JSON bytes)
+        self._snapshot_list_cache = {}  # (limit, history size, mtime, renames size) -> JSON bytes
+        # Debug and per-request log lines, flushed in batches by a daemon thread so handlers
+        # never block on the stdout lock
+        self._log_ring = deque(maxlen=4096)
+        threading.Thread(target=self._flush_log_ring, daemon=True).start()
+
+        # Static delivery: with a front proxy (TEP_SENDFILE=nginx|xsendfile) Flask only
+        # returns a redirect header and the proxy sendfile()s the bytes itself
+        self._static_dir = os.path.join(script_dir, 'static')
+        self._sendfile_mode = os.environ.get('TEP_SENDFILE', '').lower()
+        try:
+            with open(os.path.join(script_dir, 'templates', 'interactive_chat.html'), 'rb') as f:
+                # Versioned script URL per process start, so a deploy never runs stale cached JS
+                self._chat_html = f.read().replace(b'{{ js_cache_buster }}', str(int(time.time())).encode())
+        except OSError:
+            self._chat_html = None
 
         # 🔧 FIX: XMEAS to descriptive name mapping for MultiLLM backend
         self.xmeas_to_descriptive = {
@@ -1304,25 +1926,13 @@ class UnifiedControlPanel:
 
     def broadcast_sse(self, event_type, data):
         """Broadcast an SSE event to all connected clients"""
-        with self.sse_lock:
-            dead_queues = []
-            for q in self.sse_queues:
-                try:
-                    q.put_nowait({
-                        'event': event_type,
-                        'data': data,
-                        'timestamp': time.time()
-                    })
-                except queue.Full:
-                    # Queue is full, client is too slow - disconnect it
-                    dead_queues.append(q)
-
-            # Remove dead/slow clients
-            for q in dead_queues:
-                try:
-                    self.sse_queues.remove(q)
-                except ValueError:
-                    pass
+        # The payload is identical for every subscriber, so encode it once here
+        # and publish the same bytes object to the shared ring buffer.
+        self.sse.publish(encode_sse_event({
+            'event': event_type,
+            'data': data,
+            'timestamp': time.time()
+        }))
 
     def convert_xmeas_to_descriptive(self, data_dict):
         """Convert XMEAS_X format to descriptive names for MultiLLM backend"""
@@ -1334,33 +1944,563 @@ class UnifiedControlPanel:
                 converted[key] = value
         return converted
 
+    @staticmethod
+    def _snapshot_meta(snap):
+        """Summary fields shown in the snapshot list."""
+        return {
+            'id': snap.get('id'),
+            'timestamp': snap.get('timestamp'),
+            'time': snap.get('time'),
+            'name': snap.get('name', f"Analysis {snap.get('id')}"),
+            'tags': snap.get('tags', []),
+            'has_llm_analysis': bool(snap.get('llm_analyses')),
+            'has_ai_enhancement': bool(snap.get('ai_agent_enhancement')),
+            'llm_models': list(snap.get('llm_analyses', {}).keys()),
+            'feature_count': len(snap.get('feature_analysis', '').split('\n')) if snap.get('feature_analysis') else 0
+        }
+
+    def _reset_history_index(self):
+        """Drop all cached history state (caller holds _history_lock)."""
+        self._history_index = {}
+        self._history_size = 0
+        self._history_mtime = 0
+        self._history_tail.clear()
+        self._snapshot_lru.clear()
+        if self._history_mmap is not None:
+            self._history_mmap.close()
+            self._history_mmap = None
+
+    def _load_rename_overlay(self):
+        """Read rename records appended since the last call (caller holds _history_lock)."""
+        try:
+            size = os.path.getsize(self._renames_file)
+        except OSError:
+            size = 0
+        if size < self._renames_size:
+            self._rename_overlay = {}
+            self._renames_size = 0
+            self._renames_lines = 0
+        if size == self._renames_size:
+            return
+        with open(self._renames_file, 'rb') as f:
+            f.seek(self._renames_size)
+            chunk = f.read(size - self._renames_size)
+        end = chunk.rfind(b'\n') + 1
+        self._renames_lines += chunk.count(b'\n', 0, end)
+        for line in chunk[:end].splitlines():
+            try:
+                rec = json.loads(line)
+                self._rename_overlay[rec['id']] = {k: rec[k] for k in ('name', 'tags', 'last_modified') if k in rec}
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._renames_size += end
+
+    def _with_overlay(self, snap):
+        """Return snap with any pending rename applied (snap itself is not modified)."""
+        overlay = self._rename_overlay.get(snap.get('id'))
+        return {**snap, **overlay} if overlay else snap
+
+    @staticmethod
+    def _overlay_lines(lines, overlay):
+        """Yield history JSONL lines with the renames in overlay applied; other lines pass through unparsed."""
+        loads = orjson.loads if orjson is not None else json.loads
+        for line in lines:
+            # Byte-level prefilter: lines whose id prefix isn't renamed are copied unparsed
+            m = HISTORY_ID_RE.match(line)
+            if m is not None and int(m.group(1)) not in overlay:
+                yield line
+                continue
+            try:
+                snap = loads(line)
+            except ValueError:
+                yield line
+                continue
+            rename = overlay.get(snap.get('id')) if isinstance(snap, dict) else None
+            yield json_dumps_bytes({**snap, **rename}) + b'\n' if rename else line
+
+    def _compact_renames(self, min_entries=1):
+        """Fold the rename log into the history file, then truncate the log.
+
+        The backend appends to the history file, so this is skipped while it is
+        listening on :8000. The history is rewritten to a temp file and swapped in
+        with os.replace; bytes appended meanwhile are still carried over.
+        """
+        if port_is_open('127.0.0.1', 8000, timeout=0.2):
+            return False
+        with self._history_lock:
+            self._load_rename_overlay()
+            if len(self._rename_overlay) < min_entries:
+                return False
+            # Unmap the history first: Windows refuses to replace a file that is still mapped
+            self._reset_history_index()
+            if os.path.exists(self._history_file):
+                with open(self._history_file, 'rb') as f:
+                    data = f.read()
+                tmp_path = self._history_file + '.tmp'
+                with open(tmp_path, 'wb') as out:
+                    for line in self._overlay_lines(data.splitlines(keepends=True), self._rename_overlay):
+                        out.write(line)
+                    with open(self._history_file, 'rb') as f:
+                        f.seek(len(data))
+                        out.write(f.read())
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp_path, self._history_file)
+            with open(self._renames_file, 'wb'):
+                pass
+            self._rename_overlay = {}
+            self._renames_size = 0
+            self._renames_lines = 0
+            self._reset_history_index()
+        print("🗜️ Compacted snapshot renames into analysis history")
+        return True
+
+    def _append_rename(self, line):
+        """Append one rename record with a single O_APPEND write; fsync follows within a second.
+
+        Caller holds _history_lock.
+        """
+        if self._rename_fd is None:
+            os.makedirs(self._diag_dir, exist_ok=True)
+            self._rename_fd = os.open(self._renames_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(self._rename_fd, line)
+        if not self._rename_sync_pending:
+            self._rename_sync_pending = True
+            timer = threading.Timer(1.0, self._sync_renames)
+            timer.daemon = True
+            timer.start()
+
+    def _sync_renames(self):
+        """Flush rename records written since the last sync to disk."""
+        with self._history_lock:
+            self._rename_sync_pending = False
+            fd = self._rename_fd
+        if fd is not None:
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                print(f"⚠️ Could not fsync snapshot renames: {e}")
+
+    def invalidate_history_index(self):
+        """Force a full rescan on next access (use after rewriting the history file)."""
+        with self._history_lock:
+            self._reset_history_index()
+
+    def _load_history_index(self):
+        """Bring the history index up to date; returns False if there is no history file.
+
+        The backend only ever appends, so when the file grows we read just the
+        new bytes and index each complete line. A shrink or an in-place rewrite
+        (same size, new mtime) triggers a full rescan.
+        """
+        try:
+            st = os.stat(self._history_file)
+        except FileNotFoundError:
+            with self._history_lock:
+                self._reset_history_index()
+            return False
+
+        with self._history_lock:
+            self._load_rename_overlay()
+            if st.st_mtime_ns == self._history_mtime and st.st_size == self._history_size:
+                return True
+            if st.st_size < self._history_size or (
+                    st.st_size == self._history_size and st.st_mtime_ns != self._history_mtime):
+                self._reset_history_index()
+
+            if st.st_size == 0:
+                self._history_mtime = st.st_mtime_ns
+                return True
+
+            # Scan the new bytes straight from a mapping of the file (no read() copy);
+            # the same mapping then serves _read_snapshot
+            if self._history_mmap is None or len(self._history_mmap) < st.st_size:
+                if self._history_mmap is not None:
+                    self._history_mmap.close()
+                    self._history_mmap = None
+                with open(self._history_file, 'rb') as f:
+                    self._history_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mm = self._history_mmap
+
+            # Split into complete lines first (absolute offsets, up to the stat'd size);
+            # a partial trailing line is picked up once the writer finishes it
+            lines = []
+            start = self._history_size
+            while True:
+                nl = mm.find(b'\n', start, st.st_size)
+                if nl < 0:
+                    break
+                if nl > start:
+                    lines.append((start, nl))
+                start = nl + 1
+
+            # Only the newest lines feed the metadata tail, so only those need a full
+            # parse; older lines are indexed from the id prefix alone
+            parse_from = len(lines) - self._history_tail.maxlen
+            loads = orjson.loads if orjson is not None else json.loads
+            for i, (begin, end) in enumerate(lines):
+                m = HISTORY_ID_RE.match(mm, begin, end) if i < parse_from else None
+                try:
+                    if m is not None:
+                        self._history_index[int(m.group(1))] = (begin, end - begin)
+                        continue
+                    snap = loads(mm[begin:end])
+                    self._history_index[snap.get('id')] = (begin, end - begin)
+                    if i >= parse_from:
+                        self._history_tail.append(self._snapshot_meta(snap))
+                except (ValueError, UnicodeDecodeError, AttributeError):
+                    pass
+
+            self._history_size = start
+            self._history_mtime = st.st_mtime_ns
+            return True
+
+    def _recent_snapshot_meta(self, limit):
+        """List metadata of the newest `limit` snapshots, oldest first (caller holds _history_lock).
+
+        Limits within the cached tail are served from it; larger ones re-read the
+        records through the offset index, so nothing older than the tail is cut off.
+        """
+        if limit <= 0:
+            return []
+        if limit <= len(self._history_tail) or self._history_mmap is None:
+            return list(self._history_tail)[-limit:]
+        loads = orjson.loads if orjson is not None else json.loads
+        metas = []
+        for offset, length in sorted(self._history_index.values())[-limit:]:
+            try:
+                metas.append(self._snapshot_meta(loads(self._history_mmap[offset:offset + length])))
+            except (ValueError, UnicodeDecodeError, AttributeError):
+                continue
+        return metas
+
+    def _has_snapshot(self, snapshot_id):
+        """Membership test against the indexed ids; only a miss refreshes the index (one stat if unchanged)."""
+        if snapshot_id in self._history_index:
+            return True
+        return self._load_history_index() and snapshot_id in self._history_index
+
+    def _read_snapshot(self, snapshot_id, lru_size=64):
+        """Return the full snapshot dict for an id, or None if it isn't in the history.
+
+        Recently read records are kept parsed in a small LRU; the backend only
+        appends, so an entry stays valid until the index is reset by a rewrite.
+        """
+        if not self._load_history_index():
+            return None
+        with self._history_lock:
+            snap = self._snapshot_lru.get(snapshot_id)
+            if snap is not None:
+                self._snapshot_lru.move_to_end(snapshot_id)
+            else:
+                entry = self._history_index.get(snapshot_id)
+                if entry is None:
+                    return None
+                offset, length = entry
+                if self._history_mmap is None:
+                    with open(self._history_file, 'rb') as f:
+                        self._history_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if orjson is not None:
+                    # orjson parses straight from a view of the mapped pages, no intermediate copy
+                    with memoryview(self._history_mmap) as mv, mv[offset:offset + length] as view:
+                        snap = orjson.loads(view)
+                else:
+                    snap = json.loads(self._history_mmap[offset:offset + length])
+                self._snapshot_lru[snapshot_id] = snap
+                if len(self._snapshot_lru) > lru_size:
+                    self._snapshot_lru.popitem(last=False)
+            overlay = self._rename_overlay.get(snapshot_id)
+        # Callers get their own top-level dict; the cached record is never mutated
+        snap = dict(snap)
+        if overlay:
+            snap.update(overlay)
+        return snap
+
+    def _do_ultra_start(self, job_id):
+        """Background body of /api/ultra_start: start everything at 50x speed, streaming progress over SSE."""
+        results = []
+        job = self._jobs.get(job_id, {})
+        job['status'] = 'running'
+        job['lines'] = results
+
+        def progress(line):
+            # Keep the full transcript on the job and stream each line to SSE clients
+            results.append(line)
+            self.broadcast_sse('ultra_start_progress', {'job_id': job_id, 'line': line})
+
+        try:
+            # Step 1: Set ultra speed first (50x)
+            progress("🚀 Setting ultra speed (50x)...")
+            self.bridge.speed_factor = 50.0
+            self.bridge.step_interval_seconds = 180 / 50.0  # 3.6 seconds
+            self.bridge.speed_mode = 'fast_50x'
+            progress(f"✅ Speed set to 50x (interval: {self.bridge.step_interval_seconds:.1f}s)")
+
+            # Step 2: Auto-start FaultExplainer Backend
+            progress("🔧 Starting FaultExplainer backend...")
+            backend_available = False
+            try:
+                # First check if backend already running (plain TCP probe, no HTTP round-trip)
+                if port_is_open('127.0.0.1', 8000, timeout=1):
+                    progress("✅ Backend already running on port 8000")
+                    backend_available = True
+                else:
+                    # Backend not running, start it
+                    backend_success, backend_message = self.bridge.start_faultexplainer_backend()
+                    if backend_success:
+                        progress("✅ Backend started successfully")
+                        backend_available = True
+                        time.sleep(2)  # Wait for backend to initialize
+                    else:
+                        progress(f"⚠️ Backend start failed: {backend_message}")
+                        progress("ℹ️  Continuing without external backend (using unified mode)")
+                        backend_available = False
+            except Exception as e:
+                progress(f"⚠️ Backend error: {str(e)}")
+                progress("ℹ️  Continuing without external backend (using unified mode)")
+                backend_available = False
+
+            # Step 3: Start TEP simulation with ultra speed
+            progress("🏭 Starting TEP simulation at 50x speed...")
+            tep_success, tep_message = self.bridge.start_tep_simulation()
+            if not tep_success:
+                return self._finish_job(job_id, {
+                    'success': False,
+                    'message': f"❌ TEP failed: {tep_message}"
+                })
+            progress("✅ TEP simulation started at ultra speed")
+
+            # Step 4: Auto-start Bridge (if backend is available)
+            if backend_available:
+                progress("🌉 Starting data bridge...")
+                try:
+                    # Check if bridge already running
+                    if 'tep_bridge' in self.bridge.processes and self.bridge.check_process_status('tep_bridge'):
+                        progress("✅ Bridge already running")
+                    else:
+                        # Start bridge
+                        script_dir = self._script_dir
+                        venv_python = self._venv_python
+                        bridge_script = os.path.join(self._backend_dir, 'tep_faultexplainer_bridge.py')
+
+                        # 🔧 FIX: Check if files exist before starting
+                        if not os.path.exists(venv_python):
+                            progress(f"⚠️ Bridge start failed: Virtual environment python not found at {venv_python}")
+                            progress(f"💡 Hint: Try using system python or check .venv installation")
+                        elif not os.path.exists(bridge_script):
+                            progress(f"⚠️ Bridge start failed: Bridge script not found at {bridge_script}")
+                        else:
+                            # 🔧 FIX: Open log file for bridge output
+                            bridge_log = os.path.join(script_dir, 'bridge.log')
+                            # 🔧 FIX: Start bridge with output to log file (not PIPE)
+                            with open(bridge_log, 'w') as log_file:
+                                process = spawn_detached([venv_python, bridge_script], script_dir, log_file)
+                            self.bridge.processes['tep_bridge'] = process
+                            progress(f"✅ Bridge started (PID: {process.pid}) - connecting TEP to FaultExplainer")
+                            progress(f"📋 Bridge logs: {bridge_log}")
+                            time.sleep(2)  # Wait longer for bridge to initialize
+
+                            # 🔧 FIX: Check if process is still alive
+                            if process.poll() is not None:
+                                progress(f"⚠️ Bridge process exited immediately (check {bridge_log})")
+                            else:
+                                progress("✅ Bridge is running")
+                except Exception as e:
+                    progress(f"⚠️ Bridge start failed: {str(e)}")
+                    progress(f"📋 Full error: {traceback.format_exc()}")
+            else:
+                progress("ℹ️  Bridge not started (no external backend)")
+
+            # Step 5: Start frontend (optional)
+            progress("🖥️ Starting FaultExplainer frontend...")
+            try:
+                frontend_success, frontend_message = self.bridge.start_faultexplainer_frontend()
+                if frontend_success:
+                    progress("✅ Frontend started")
+                else:
+                    progress("⚠️ Frontend start failed (optional)")
+            except:
+                progress("⚠️ Frontend start failed (optional)")
+
+            # Step 6: Final verification
+            time.sleep(1)
+            health = self.bridge.system_health_check()
+
+            progress("🎉 ULTRA-FAST SYSTEM READY!")
+            progress(f"📊 Data points every {self.bridge.step_interval_seconds:.1f} seconds")
+            if backend_available:
+                progress("🤖 External MultiLLM Backend: Connected")
+            else:
+                progress("🤖 Using unified control panel (no external backend)")
+            progress("⚡ 50x speed = 50x faster than real-time!")
+
+            return self._finish_job(job_id, {
+                'success': True,
+                'message': '\n'.join(results),
+                'speed_factor': 50.0,
+                'interval_seconds': self.bridge.step_interval_seconds,
+                'health': health
+            })
+
+        except Exception as e:
+            return self._finish_job(job_id, {
+                'success': False,
+                'message': f"❌ Ultra start failed: {str(e)}"
+            })
+
+    def _submit_job(self, fn, *args):
+        """Run fn(job_id, *args) on the worker pool; returns the job_id to poll."""
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {'job_id': job_id, 'status': 'pending', 'result': None}
+        # Forget the oldest finished jobs; pending/running ones stay so their pollers never 404
+        excess = len(self._jobs) - 20
+        if excess > 0:
+            finished = [jid for jid, job in list(self._jobs.items())
+                        if job['status'] in ('done', 'failed')]
+            for jid in finished[:excess]:
+                self._jobs.pop(jid, None)
+        self._executor.submit(fn, job_id, *args)
+        return job_id
+
+    def _finish_job(self, job_id, result, event='ultra_start_done'):
+        """Store a background job's final result and announce it to SSE clients."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job['result'] = result
+            job['status'] = 'done' if result.get('success') else 'failed'
+        self.broadcast_sse(event, {'job_id': job_id, **result})
+        return result
+
+    def _do_report(self, job_id, snapshot, snapshot_id, chat_history, ruled_out, conclusion, email):
+        """Background body of /api/report/generate: render the report and try to email it."""
+        job = self._jobs.get(job_id, {})
+        job['status'] = 'running'
+        try:
+            # Report generation modules live in the backend directory (on sys.path since __init__)
+            from report_generator import generate_pdf_report
+            from email_sender import send_report_email, generate_report_email_body
+
+            # Generate PDF report (falls back to Markdown if reportlab not installed)
+            report_path = generate_pdf_report(snapshot, chat_history, ruled_out, conclusion)
+            report_format = 'PDF' if report_path.endswith('.pdf') else 'Markdown'
+
+            # Generate email body
+            email_body = generate_report_email_body(
+                snapshot_id=snapshot_id,
+                snapshot_name=snapshot.get('timestamp', f'Analysis {snapshot_id}'),
+                conclusion=conclusion,
+                report_filename=os.path.basename(report_path)
+            )
+
+            # Try to send email (will gracefully fail if SMTP not configured)
+            email_sent = send_report_email(
+                recipient=email,
+                subject=f"TEP RCA Report - {snapshot.get('timestamp', snapshot_id)}",
+                body_html=email_body,
+                attachments=[report_path]
+            )
+
+            return self._finish_job(job_id, {
+                'success': True,
+                'status': 'success' if email_sent else 'saved_locally',
+                'recipient': email,
+                'filename': os.path.basename(report_path),
+                'filepath': report_path,
+                'download_url': f'/api/report/download/{os.path.basename(report_path)}',
+                'format': report_format,
+                'email_sent': email_sent,
+                'message': 'Report generated and sent' if email_sent else 'Report generated and saved locally'
+            }, event='report_done')
+
+        except Exception as e:
+            print("❌ Error in /api/report/generate:")
+            traceback.print_exc()
+            return self._finish_job(job_id, {'success': False, 'error': str(e)}, event='report_done')
+
+    def _flush_log_ring(self, interval=0.5):
+        """Write queued log lines to stdout (same stream as print()) in one batch every interval seconds."""
+        while True:
+            time.sleep(interval)
+            batch = []
+            while self._log_ring:
+                batch.append(self._log_ring.popleft())
+            if batch:
+                sys.stdout.write('\n'.join(batch) + '\n')
+                sys.stdout.flush()
+
+    def _cached(self, key, build, ttl=0.5):
+        """Return build(), recomputing at most once per ttl seconds however many clients poll.
+        Exceptions from build() propagate and are not cached; drop an entry with _response_cache.pop(key).
+        """
+        hit = self._response_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        lock = self._response_cache_locks.setdefault(key, threading.Lock())
+        if hit is not None and not lock.acquire(blocking=False):
+            # Another request is already refreshing: serve the previous value instead of
+            # parking this worker thread behind a possibly slow build()
+            return hit[1]
+        if hit is None:
+            lock.acquire()
+        try:
+            # Another request may have refreshed the entry while we waited
+            hit = self._response_cache.get(key)
+            if hit is None or time.monotonic() - hit[0] >= ttl:
+                hit = (time.monotonic(), build())
+                self._response_cache[key] = hit
+        finally:
+            lock.release()
+        return hit[1]
+
+    def _cached_json(self, key, build, ttl=0.5, max_age=None):
+        """Serve build() as JSON through _cached, so the encoded bytes are shared between pollers.
+        The ETag is hashed once per cache entry; a matching If-None-Match gets a bodyless 304.
+        """
+        def encode():
+            body = json_dumps_bytes(build())
+            return body, generate_etag(body)
+
+        body, etag = self._cached(key, encode, ttl)
+        resp = Response(body, mimetype='application/json')
+        resp.set_etag(etag)
+        if max_age is not None:
+            resp.headers['Cache-Control'] = f'max-age={max_age}'
+        return resp.make_conditional(request)
+
+    def _send_file(self, path, mime):
+        """Send a history export as an attachment with ETag/Last-Modified so unchanged files answer 304."""
+        return send_file(path, mimetype=mime, as_attachment=True, conditional=True, etag=True, max_age=0)
+
     def setup_routes(self):
         """Setup Flask routes."""
 
         @self.app.route('/')
         def index():
             # Use timestamp for aggressive cache-busting (Safari compatibility)
-            import time
             js_cache_buster = str(int(time.time()))
             return render_template('control_panel.html', js_cache_buster=js_cache_buster)
 
         @self.app.route('/chat')
         def chat_page():
             """Interactive RCA Chat page"""
-            # Read and serve the chat HTML file
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            chat_html_path = os.path.join(script_dir, 'templates', 'interactive_chat.html')
-            if os.path.exists(chat_html_path):
-                with open(chat_html_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            else:
+            # Served from the bytes cached at startup
+            if self._chat_html is None:
                 return "Chat page not found", 404
-
-
+            return Response(self._chat_html, mimetype='text/html')
 
         @self.app.route('/static/<path:filename>')
         def static_files(filename):
-            response = send_from_directory('.', os.path.join('static', filename))
+            if self._sendfile_mode in ('nginx', 'xsendfile'):
+                path = safe_join(self._static_dir, filename)
+                if path is None or not os.path.isfile(path):
+                    abort(404)
+                response = Response(mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream')
+                if self._sendfile_mode == 'nginx':
+                    response.headers['X-Accel-Redirect'] = f'/_protected_static/{filename}'
+                else:
+                    response.headers['X-Sendfile'] = path
+            else:
+                response = send_from_directory(self._static_dir, filename, conditional=True)
             # Add no-cache headers for Safari compatibility
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response.headers['Pragma'] = 'no-cache'
@@ -1370,222 +2510,102 @@ class UnifiedControlPanel:
         @self.app.route('/stream')
         def stream():
             """Server-Sent Events (SSE) endpoint for real-time updates"""
-            def generate():
-                # Create a queue for this client
-                client_queue = queue.Queue(maxsize=100)
-
-                # Register this client
-                with self.sse_lock:
-                    self.sse_queues.append(client_queue)
-
-                print(f"✅ SSE client connected (total: {len(self.sse_queues)})")
-
+            # TCP_NODELAY comes from the listening socket (make_listen_socket)
+            # Register this client with a read cursor at the current write position
+            cursor = self.sse.subscribe()
+            if cursor is None:
+                # Every SSE slot is taken; the browser's EventSource retries on its own
+                return Response('Too many live update streams\n', status=503,
+                                mimetype='text/plain', headers={'Retry-After': '10'})
+            print(f"✅ SSE client connected (total: {self.sse.client_count})")
+
+            def generate(cursor):
                 try:
                     # Send initial connection event
-                    yield f"data: {json.dumps({'event': 'connected', 'message': 'SSE stream established'})}\n\n"
+                    yield encode_sse_event({'event': 'connected', 'message': 'SSE stream established'})
 
                     # Keep connection alive and send events
                     while True:
-                        try:
-                            # Wait for events with timeout for heartbeat
-                            event = client_queue.get(timeout=30)
-
-                            # Send the event to client
-                            event_data = {
-                                'event': event.get('event'),
-                                'data': event.get('data'),
-                                'timestamp': event.get('timestamp')
-                            }
-                            yield f"data: {json.dumps(event_data)}\n\n"
-
-                        except queue.Empty:
-                            # Send heartbeat every 30 seconds to keep connection alive
-                            yield f": heartbeat\n\n"
+                        # Block until something is published; the shared heartbeat
+                        # arrives through the same ring every 30 seconds.
+                        # broadcast_sse already encoded the events to wire bytes
+                        frames, cursor = self.sse.read(cursor)
+                        if frames is None:
+                            # Client is too slow and fell a full buffer behind - disconnect it
+                            print(f"⚠️ SSE client lagged behind, disconnecting")
+                            break
+                        # Coalesce a burst of pending frames into one write
+                        if len(frames) == 1:
+                            yield frames[0]
+                        else:
+                            yield b''.join(frames)
 
                 except GeneratorExit:
                     # Client disconnected
                     print(f"❌ SSE client disconnected")
-                finally:
-                    # Remove this client's queue
-                    with self.sse_lock:
-                        try:
-                            self.sse_queues.remove(client_queue)
-                            print(f"🔄 SSE client removed (remaining: {len(self.sse_queues)})")
-                        except ValueError:
-                            pass
 
-            return Response(
-                stream_with_context(generate()),
+            def release():
+                # Runs when the server closes the response, even if generate() never started
+                self.sse.unsubscribe()
+                print(f"🔄 SSE client removed (remaining: {self.sse.client_count})")
+
+            response = Response(
+                stream_with_context(generate(cursor)),
                 mimetype='text/event-stream',
                 headers={
                     'Cache-Control': 'no-cache',
                     'X-Accel-Buffering': 'no',
-                    'Connection': 'keep-alive'
+                    # No 'Connection' header: it is hop-by-hop, and PEP 3333 servers
+                    # such as waitress reject it from the application
                 }
             )
+            response.call_on_close(release)
+            return response
 
         @self.app.route('/api/status')
         def get_status():
-            import time
-            from flask import request
-
-            # DEBUG: Log every request to identify spam source
-            current_time = time.strftime('%H:%M:%S', time.localtime())
-            user_agent = request.headers.get('User-Agent', 'Unknown')[:50]
-            referer = request.headers.get('Referer', 'No-Referer')
-            remote_addr = request.remote_addr
+            # DEBUG: Log every request to identify spam source (TEP_DEBUG_STATUS_LOG=1)
+            if self.debug_status_log:
+                current_time = time.strftime('%H:%M:%S', time.localtime())
+                user_agent = request.headers.get('User-Agent', 'Unknown')[:50]
+                referer = request.headers.get('Referer', 'No-Referer')
+                remote_addr = request.remote_addr
 
-            print(f"🔍 [{current_time}] /api/status from {remote_addr} | UA: {user_agent}... | Ref: {referer}")
+                self._log_ring.append(f"🔍 [{current_time}] /api/status from {remote_addr} | UA: {user_agent}... | Ref: {referer}")
 
-            return jsonify(self.bridge.get_status())
+            return self._cached_json('status', self.bridge.get_status)
 
         @self.app.route('/api/health')
         def health_check():
-            return jsonify(self.bridge.system_health_check())
+            return self._cached_json('health', self.bridge.system_health_check)
 
         @self.app.route('/api/ultra_start', methods=['POST'])
         def ultra_start():
-            """One-click ultra-fast startup: Start everything at 50x speed"""
-            try:
-                results = []
-
-                # Step 1: Set ultra speed first (50x)
-                results.append("🚀 Setting ultra speed (50x)...")
-                self.bridge.speed_factor = 50.0
-                self.bridge.step_interval_seconds = 180 / 50.0  # 3.6 seconds
-                self.bridge.speed_mode = 'fast_50x'
-                results.append(f"✅ Speed set to 50x (interval: {self.bridge.step_interval_seconds:.1f}s)")
-
-                # Step 2: Auto-start FaultExplainer Backend
-                results.append("🔧 Starting FaultExplainer backend...")
-                backend_available = False
-                try:
-                    import requests
-                    # First check if backend already running
-                    try:
-                        response = requests.get('http://127.0.0.1:8000/status', timeout=1)
-                        if response.status_code == 200:
-                            results.append("✅ Backend already running on port 8000")
-                            backend_available = True
-                    except:
-                        # Backend not running, start it
-                        backend_success, backend_message = self.bridge.start_faultexplainer_backend()
-                        if backend_success:
-                            results.append("✅ Backend started successfully")
-                            backend_available = True
-                            time.sleep(2)  # Wait for backend to initialize
-                        else:
-                            results.append(f"⚠️ Backend start failed: {backend_message}")
-                            results.append("ℹ️  Continuing without external backend (using unified mode)")
-                            backend_available = False
-                except Exception as e:
-                    results.append(f"⚠️ Backend error: {str(e)}")
-                    results.append("ℹ️  Continuing without external backend (using unified mode)")
-                    backend_available = False
-
-                # Step 3: Start TEP simulation with ultra speed
-                import time
-                results.append("🏭 Starting TEP simulation at 50x speed...")
-                tep_success, tep_message = self.bridge.start_tep_simulation()
-                if not tep_success:
-                    return jsonify({
-                        'success': False,
-                        'message': f"❌ TEP failed: {tep_message}"
-                    })
-                results.append("✅ TEP simulation started at ultra speed")
-
-                # Step 4: Auto-start Bridge (if backend is available)
-                if backend_available:
-                    results.append("🌉 Starting data bridge...")
-                    try:
-                        # Check if bridge already running
-                        if 'tep_bridge' in self.bridge.processes and self.bridge.check_process_status('tep_bridge'):
-                            results.append("✅ Bridge already running")
-                        else:
-                            # Start bridge
-                            import subprocess
-                            script_dir = os.path.dirname(os.path.abspath(__file__))
-                            venv_python = os.path.join(script_dir, '.venv','bin','python')
-                            bridge_script = os.path.join(script_dir, 'backend', 'tep_faultexplainer_bridge.py')
-
-                            # 🔧 FIX: Check if files exist before starting
-                            if not os.path.exists(venv_python):
-                                results.append(f"⚠️ Bridge start failed: Virtual environment python not found at {venv_python}")
-                                results.append(f"💡 Hint: Try using system python or check .venv installation")
-                            elif not os.path.exists(bridge_script):
-                                results.append(f"⚠️ Bridge start failed: Bridge script not found at {bridge_script}")
-                            else:
-                                # 🔧 FIX: Open log file for bridge output
-                                bridge_log = os.path.join(script_dir, 'bridge.log')
-                                log_file = open(bridge_log, 'w')
-
-                                # 🔧 FIX: Start bridge with output to log file (not PIPE)
-                                process = subprocess.Popen(
-                                    [venv_python, bridge_script],
-                                    cwd=script_dir,
-                                    stdout=log_file,
-                                    stderr=subprocess.STDOUT,
-                                    start_new_session=True  # Detach from parent
-                                )
-                                self.bridge.processes['tep_bridge'] = process
-                                results.append(f"✅ Bridge started (PID: {process.pid}) - connecting TEP to FaultExplainer")
-                                results.append(f"📋 Bridge logs: {bridge_log}")
-                                time.sleep(2)  # Wait longer for bridge to initialize
-
-                                # 🔧 FIX: Check if process is still alive
-                                if process.poll() is not None:
-                                    results.append(f"⚠️ Bridge process exited immediately (check {bridge_log})")
-                                else:
-                                    results.append("✅ Bridge is running")
-                    except Exception as e:
-                        import traceback
-                        results.append(f"⚠️ Bridge start failed: {str(e)}")
-                        results.append(f"📋 Full error: {traceback.format_exc()}")
-                else:
-                    results.append("ℹ️  Bridge not started (no external backend)")
+            """One-click ultra-fast startup: Start everything at 50x speed.
 
-                # Step 5: Start frontend (optional)
-                results.append("🖥️ Starting FaultExplainer frontend...")
-                try:
-                    frontend_success, frontend_message = self.bridge.start_faultexplainer_frontend()
-                    if frontend_success:
-                        results.append("✅ Frontend started")
-                    else:
-                        results.append("⚠️ Frontend start failed (optional)")
-                except:
-                    results.append("⚠️ Frontend start failed (optional)")
-
-                # Step 6: Final verification
-                time.sleep(1)
-                health = self.bridge.system_health_check()
-
-                results.append("🎉 ULTRA-FAST SYSTEM READY!")
-                results.append(f"📊 Data points every {self.bridge.step_interval_seconds:.1f} seconds")
-                if backend_available:
-                    results.append("🤖 External MultiLLM Backend: Connected")
-                else:
-                    results.append("🤖 Using unified control panel (no external backend)")
-                results.append("⚡ 50x speed = 50x faster than real-time!")
-
-                return jsonify({
-                    'success': True,
-                    'message': '\n'.join(results),
-                    'speed_factor': 50.0,
-                    'interval_seconds': self.bridge.step_interval_seconds,
-                    'health': health
-                })
-
-            except Exception as e:
-                return jsonify({
-                    'success': False,
-                    'message': f"❌ Ultra start failed: {str(e)}"
-                })
+            Returns 202 immediately; the startup runs on a worker thread, streams
+            'ultra_start_progress' SSE events and can be polled at /api/ultra_start/<job_id>.
+            """
+            job_id = self._submit_job(self._do_ultra_start)
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'pending',
+                'message': '🚀 Ultra start in progress...'
+            }), 202
+
+        @self.app.route('/api/ultra_start/<job_id>', methods=['GET'])
+        def ultra_start_status(job_id):
+            job = self._jobs.get(job_id)
+            if job is None:
+                return jsonify({'error': 'Unknown job'}), 404
+            return jsonify(job)
 
         @self.app.route('/api/tep/start', methods=['POST'])
         def start_tep():
             success, message = self.bridge.start_tep_simulation()
             # Handle form submissions by redirecting back to main page
-            if request.content_type and 'application/x-www-form-urlencoded' in request.content_type:
+            if request.mimetype == 'application/x-www-form-urlencoded':
                 return redirect(url_for('index'))
             return jsonify({'success': success, 'message': message})
 
@@ -1610,14 +2630,20 @@ class UnifiedControlPanel:
 
         @self.app.route('/api/pca/status', methods=['GET'])
         def pca_training_status():
-            return jsonify({
-                'training_mode': bool(self.bridge.pca_training_mode),
-                'collected': len(self.bridge.pca_training_data),
-                'target': self.bridge.pca_training_target,
-                'progress': len(self.bridge.pca_training_data) / self.bridge.pca_training_target * 100,
-                'is_stable': bool(self.bridge.is_stable),
-                'stability_buffer_size': len(self.bridge.stability_buffer)
-            })
+            # Rebuild only when the bridge's training/stability generation has moved
+            gen = self.bridge.pca_gen
+            cached = self._pca_cache
+            if cached is None or cached[0] != gen:
+                cached = (gen, json_dumps_bytes({
+                    'training_mode': bool(self.bridge.pca_training_mode),
+                    'collected': len(self.bridge.pca_training_data),
+                    'target': self.bridge.pca_training_target,
+                    'progress': len(self.bridge.pca_training_data) / self.bridge.pca_training_target * 100,
+                    'is_stable': bool(self.bridge.is_stable),
+                    'stability_buffer_size': len(self.bridge.stability_buffer)
+                }))
+                self._pca_cache = cached
+            return Response(cached[1], mimetype='application/json')
 
         @self.app.route('/api/pca/stabilize', methods=['POST'])
         def stabilize_pca():
@@ -1701,11 +2727,11 @@ class UnifiedControlPanel:
             value = data.get('value')
 
             success = self.bridge.set_xmv(xmv_num, value)
-            return jsonify({
+            return json_response({
                 'success': success,
                 'xmv_num': xmv_num,
                 'value': float(value) if success else None,
-                'current_xmv_state': self.bridge.xmv_values.tolist() if hasattr(self.bridge, 'xmv_values') else None
+                'current_xmv_state': self.bridge.xmv_list()
             })
 
         @self.app.route('/api/idv/set', methods=['POST'])
@@ -1717,12 +2743,13 @@ class UnifiedControlPanel:
             success = self.bridge.set_idv(idv_num, value)
 
             # Return current IDV state for debugging
-            return jsonify({
+            idv_list, active_faults = self.bridge.idv_state()
+            return json_response({
                 'success': success,
                 'idv_num': idv_num,
                 'value': int(value) if success else None,
-                'current_idv_state': self.bridge.idv_values.tolist(),
-                'active_faults': [i+1 for i, v in enumerate(self.bridge.idv_values) if v == 1]
+                'current_idv_state': idv_list,
+                'active_faults': active_faults
             })
 
         @self.app.route('/api/idv/test', methods=['POST'])
@@ -1730,24 +2757,28 @@ class UnifiedControlPanel:
             """Test if IDV changes actually affect simulation output."""
             try:
                 # Run baseline simulation (all IDV = 0)
-                baseline_idv = np.zeros(20)
-                self.bridge.idv_values = baseline_idv.copy()
+                self.bridge.idv_values = self._idv_zero.copy()
                 baseline_data = self.bridge.run_tep_simulation_step()
 
                 # Run with IDV_1 = 1 (A/C Feed Ratio fault)
-                test_idv = np.zeros(20)
+                test_idv = self._idv_scratch
+                test_idv[:] = 0
                 test_idv[0] = 1  # IDV_1
                 self.bridge.idv_values = test_idv.copy()
                 fault_data = self.bridge.run_tep_simulation_step()
 
                 # Compare key measurements
                 if baseline_data and fault_data:
+                    a = measurement_vector(baseline_data)
+                    b = measurement_vector(fault_data)
+                    # Single vectorised reduction; a shape mismatch counts as a difference
+                    changed = a.shape != b.shape or (a.size > 0 and np.abs(a - b).max() > 1e-9)
                     comparison = {
                         'baseline_reactor_temp': baseline_data.get('XMEAS_9', 'N/A'),
                         'fault_reactor_temp': fault_data.get('XMEAS_9', 'N/A'),
                         'baseline_reactor_pressure': baseline_data.get('XMEAS_7', 'N/A'),
                         'fault_reactor_pressure': fault_data.get('XMEAS_7', 'N/A'),
-                        'difference_detected': baseline_data != fault_data,
+                        'difference_detected': bool(changed),
                         'test_successful': True
                     }
                 else:
@@ -1766,7 +2797,7 @@ class UnifiedControlPanel:
             else:
                 success, message = self.bridge.start_faultexplainer_backend()
             # Handle form submissions by redirecting back to main page
-            if request.content_type and 'application/x-www-form-urlencoded' in request.content_type:
+            if request.mimetype == 'application/x-www-form-urlencoded':
                 return redirect(url_for('index'))
             return jsonify({'success': success, 'message': message})
 
@@ -1778,31 +2809,35 @@ class UnifiedControlPanel:
         @self.app.route('/api/logs/<name>')
         def get_log(name):
             # Only allow known names
-            if name not in ('sse','ingest'):
+            if name not in ALLOWED_LOGS:
                 return jsonify({'error':'invalid log'}), 400
-            # Get script directory and build path to local backend diagnostics
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            bdir = os.path.join(script_dir, 'backend','diagnostics')
-            path = os.path.join(bdir, f"{name}.log")
+            path = os.path.join(self._diag_dir, f"{name}.log")
             try:
                 if not os.path.exists(path):
                     return jsonify({'lines': [f'No log file found: {path}']}), 200
-                with open(path,'r',encoding='utf-8',errors='replace') as f:
-                    lines = f.readlines()[-200:]
-                return jsonify({'lines': lines})
+                return jsonify({'lines': tail_lines(path, 200)})
             except Exception as e:
                 return jsonify({'lines': [f'Error reading log: {e}']}), 200
 
         @self.app.route('/api/analysis/history/download/<fmt>')
         def download_history(fmt):
-            # Get script directory and build path to local backend diagnostics
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            diag_dir = os.path.join(script_dir, 'backend','diagnostics')
+            diag_dir = self._diag_dir
             if fmt == 'jsonl':
-                path = os.path.join(diag_dir, 'analysis_history.jsonl')
+                path = self._history_file
                 if not os.path.exists(path):
                     return jsonify({'error':'missing'}), 404
-                return self._send_file(path, 'application/json')
+                self._load_history_index()  # also picks up new rename records
+                with self._history_lock:
+                    overlay = dict(self._rename_overlay)
+                if not overlay:
+                    return self._send_file(path, 'application/json')
+
+                # Renames not yet compacted: stream the file with them applied
+                def gen():
+                    with open(path, 'rb') as f:
+                        yield from self._overlay_lines(f, overlay)
+                return Response(stream_with_context(gen()), mimetype='application/json',
+                                headers={'Content-Disposition': 'attachment; filename=analysis_history.jsonl'})
             if fmt == 'md':
                 path = os.path.join(diag_dir, 'analysis_history.md')
                 if not os.path.exists(path):
@@ -1810,16 +2845,12 @@ class UnifiedControlPanel:
                 return self._send_file(path, 'text/markdown')
             return jsonify({'error':'invalid fmt'}), 400
 
-        def _send_file(self, path, mime):
-            from flask import send_file
-            return send_file(path, mimetype=mime, as_attachment=True)
         @self.app.route('/api/analysis/history/download/bydate/<datestr>')
         def download_history_by_date(datestr):
             # datestr format: YYYY-MM-DD
-            # Get script directory and build path to local backend diagnostics
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            diag_dir = os.path.join(script_dir, 'backend','diagnostics','analysis_history')
-            path = os.path.join(diag_dir, f"{datestr}.md")
+            if not DATE_RE.match(datestr):
+                return jsonify({'error':'invalid date'}), 400
+            path = os.path.join(self._history_dir, f"{datestr}.md")
             if not os.path.exists(path):
                 return jsonify({'error':'missing'}), 404
             return self._send_file(path, 'text/markdown')
@@ -1831,35 +2862,22 @@ class UnifiedControlPanel:
             """List all available snapshots from local file"""
             try:
                 limit = int(request.args.get('limit', 50))
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                history_file = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history.jsonl')
-
-                if not os.path.exists(history_file):
-                    return jsonify({'snapshots': [], 'source': 'local_file', 'message': 'No history file found'}), 200
-
-                snapshots = []
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    for line in lines[-limit:]:
-                        if line.strip():
-                            try:
-                                snap = json.loads(line)
-                                snapshot_meta = {
-                                    'id': snap.get('id'),
-                                    'timestamp': snap.get('timestamp'),
-                                    'time': snap.get('time'),
-                                    'name': snap.get('name', f"Analysis {snap.get('id')}"),
-                                    'tags': snap.get('tags', []),
-                                    'has_llm_analysis': bool(snap.get('llm_analyses')),
-                                    'has_ai_enhancement': bool(snap.get('ai_agent_enhancement')),
-                                    'llm_models': list(snap.get('llm_analyses', {}).keys()),
-                                    'feature_count': len(snap.get('feature_analysis', '').split('\n')) if snap.get('feature_analysis') else 0
-                                }
-                                snapshots.append(snapshot_meta)
-                            except json.JSONDecodeError:
-                                continue
-
-                return jsonify({'snapshots': snapshots, 'total': len(snapshots), 'source': 'local_file'}), 200
+
+                if not self._load_history_index():
+                    return json_response({'snapshots': [], 'source': 'local_file', 'message': 'No history file found'})
+
+                with self._history_lock:
+                    # Key on the index state: any append, rewrite or rename changes it
+                    key = (limit, self._history_size, self._history_mtime, self._renames_size)
+                    body = self._snapshot_list_cache.get(key)
+                    if body is None:
+                        snapshots = [self._with_overlay(m) for m in self._recent_snapshot_meta(limit)]
+                        body = json_dumps_bytes({'snapshots': snapshots, 'total': len(snapshots), 'source': 'local_file'})
+                        if len(self._snapshot_list_cache) >= 16:
+                            self._snapshot_list_cache.clear()
+                        self._snapshot_list_cache[key] = body
+
+                return Response(body, mimetype='application/json')
             except Exception as e:
                 return jsonify({'error': str(e), 'snapshots': []}), 500
 
@@ -1867,21 +2885,12 @@ class UnifiedControlPanel:
         def get_snapshot(snapshot_id):
             """Get full snapshot data by ID"""
             try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                history_file = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history.jsonl')
-
-                if not os.path.exists(history_file):
+                if not os.path.exists(self._history_file):
                     return jsonify({'error': 'History file not found'}), 404
 
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                snap = json.loads(line)
-                                if snap.get('id') == snapshot_id:
-                                    return jsonify({'snapshot': snap, 'source': 'local_file'}), 200
-                            except json.JSONDecodeError:
-                                continue
+                snap = self._read_snapshot(snapshot_id)
+                if snap is not None:
+                    return json_response({'snapshot': snap, 'source': 'local_file'})
 
                 return jsonify({'error': 'Snapshot not found'}), 404
             except Exception as e:
@@ -1899,34 +2908,25 @@ class UnifiedControlPanel:
                 if not snapshot_id or not new_name:
                     return jsonify({'error': 'id and name are required'}), 400
 
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                history_file = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history.jsonl')
-
-                if not os.path.exists(history_file):
+                if not self._load_history_index():
                     return jsonify({'error': 'History file not found'}), 404
 
-                snapshots = []
-                updated = False
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                snap = json.loads(line)
-                                if snap.get('id') == snapshot_id:
-                                    snap['name'] = new_name
-                                    snap['tags'] = tags
-                                    snap['last_modified'] = datetime.now().isoformat()
-                                    updated = True
-                                snapshots.append(snap)
-                            except json.JSONDecodeError:
-                                continue
-
-                if not updated:
-                    return jsonify({'error': 'Snapshot not found'}), 404
-
-                with open(history_file, 'w', encoding='utf-8') as f:
-                    for snap in snapshots:
-                        f.write(json.dumps(snap, ensure_ascii=False) + '\n')
+                with self._history_lock:
+                    if snapshot_id not in self._history_index:
+                        return jsonify({'error': 'Snapshot not found'}), 404
+                    record = {
+                        'id': snapshot_id,
+                        'name': new_name,
+                        'tags': tags,
+                        'last_modified': datetime.now().isoformat()
+                    }
+                    # O(1) append to the rename log instead of rewriting the whole history
+                    self._append_rename(json_dumps_bytes(record) + b'\n')
+
+                # Repeated renames of the same snapshots grow the log, not the overlay:
+                # compact by records appended, so startup replay stays bounded
+                if self._renames_lines >= RENAME_COMPACT_LINES:
+                    self._compact_renames()
 
                 return jsonify({'status': 'success', 'message': 'Snapshot renamed'}), 200
             except Exception as e:
@@ -1940,8 +2940,7 @@ class UnifiedControlPanel:
             try:
                 # Proxy to backend if available
                 try:
-                    import requests
-                    r = requests.post('http://127.0.0.1:8000/chat', json=request.get_json(), timeout=30)
+                    r = self._backend_session.post('http://127.0.0.1:8000/chat', json=request.get_json(), timeout=30)
                     return jsonify(r.json()), r.status_code
                 except:
                     return chat_enhanced_local()
@@ -1957,20 +2956,7 @@ class UnifiedControlPanel:
             if not query:
                 return jsonify({'error': 'query is required'}), 400
 
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            history_file = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history.jsonl')
-
-            snapshot = None
-            with open(history_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            snap = json.loads(line)
-                            if snap.get('id') == analysis_id:
-                                snapshot = snap
-                                break
-                        except json.JSONDecodeError:
-                            continue
+            snapshot = self._read_snapshot(analysis_id)
 
             if not snapshot:
                 return jsonify({'error': 'Snapshot not found'}), 404
@@ -1991,8 +2977,7 @@ class UnifiedControlPanel:
             """Save ruled-out hypothesis"""
             try:
                 try:
-                    import requests
-                    r = requests.post('http://127.0.0.1:8000/context/ruled_out', json=request.get_json(), timeout=10)
+                    r = self._backend_session.post('http://127.0.0.1:8000/context/ruled_out', json=request.get_json(), timeout=10)
                     return jsonify(r.json()), r.status_code
                 except:
                     return jsonify({'ok': True, 'mode': 'local_fallback'}), 200
@@ -2019,81 +3004,53 @@ class UnifiedControlPanel:
                 except (ValueError, TypeError):
                     return jsonify({'error': 'Invalid snapshot_id format'}), 400
 
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                history_file = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history.jsonl')
-
-                # Check if history file exists
-                if not os.path.exists(history_file):
-                    return jsonify({'error': f'Analysis history file not found: {history_file}'}), 404
-
-                # Load snapshot from JSONL
-                snapshot = None
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                snap = json.loads(line)
-                                # Compare as integers
-                                if snap.get('id') == snapshot_id:
-                                    snapshot = snap
-                                    break
-                            except json.JSONDecodeError as e:
-                                print(f"⚠️ Failed to parse line in analysis_history.jsonl: {e}")
-                                continue
+                history_file = self._history_file
 
-                if not snapshot:
+                # Reject unknown ids from the in-memory index before touching the file
+                if not self._has_snapshot(snapshot_id):
+                    if not os.path.exists(history_file):
+                        return jsonify({'error': f'Analysis history file not found: {history_file}'}), 404
                     return jsonify({'error': f'Snapshot with ID {snapshot_id} not found in history'}), 404
 
-                # Import report generation modules from backend directory
-                import sys
-                backend_dir = os.path.join(script_dir, 'backend')
-                if backend_dir not in sys.path:
-                    sys.path.insert(0, backend_dir)
-
-                from report_generator import generate_pdf_report
-                from email_sender import send_report_email, generate_report_email_body
-
-                # Generate PDF report (falls back to Markdown if reportlab not installed)
-                report_path = generate_pdf_report(snapshot, chat_history, ruled_out, conclusion)
-                report_format = 'PDF' if report_path.endswith('.pdf') else 'Markdown'
-
-                # Generate email body
-                email_body = generate_report_email_body(
-                    snapshot_id=snapshot_id,
-                    snapshot_name=snapshot.get('timestamp', f'Analysis {snapshot_id}'),
-                    conclusion=conclusion,
-                    report_filename=os.path.basename(report_path)
-                )
+                # Load snapshot via the id -> (offset, length) index: one seek + one parse
+                snapshot = self._read_snapshot(snapshot_id)
 
-                # Try to send email (will gracefully fail if SMTP not configured)
-                email_sent = send_report_email(
-                    recipient=email,
-                    subject=f"TEP RCA Report - {snapshot.get('timestamp', snapshot_id)}",
-                    body_html=email_body,
-                    attachments=[report_path]
-                )
+                if not snapshot:
+                    return jsonify({'error': f'Snapshot with ID {snapshot_id} not found in history'}), 404
 
-                return jsonify({
-                    'status': 'success' if email_sent else 'saved_locally',
-                    'recipient': email,
-                    'filename': os.path.basename(report_path),
-                    'filepath': report_path,
-                    'format': report_format,
-                    'email_sent': email_sent,
-                    'message': 'Report generated and sent' if email_sent else 'Report generated and saved locally'
-                }), 200
+                # PDF rendering and SMTP take seconds: hand them to a worker and return at once
+                job_id = self._submit_job(self._do_report, snapshot, snapshot_id,
+                                          chat_history, ruled_out, conclusion, email)
+                return jsonify({'job_id': job_id, 'status': 'queued'}), 202
 
             except Exception as e:
-                import traceback
                 print("❌ Error in /api/report/generate:")
                 traceback.print_exc()
                 return jsonify({'error': str(e)}), 500
 
+        @self.app.route('/api/report/download/<name>', methods=['GET'])
+        def download_report(name):
+            """Download a generated RCA report (sent via sendfile, conditional on ETag)."""
+            if not REPORT_NAME_RE.match(name):
+                return jsonify({'error': 'invalid report name'}), 400
+            path = safe_join(self._diag_dir, name)
+            if path is None or not os.path.isfile(path):
+                return jsonify({'error': 'Report not found'}), 404
+            mime = 'application/pdf' if name.endswith('.pdf') else 'text/markdown'
+            return self._send_file(path, mime)
+
+        @self.app.route('/api/report/status/<job_id>', methods=['GET'])
+        def report_status(job_id):
+            job = self._jobs.get(job_id)
+            if job is None:
+                return jsonify({'error': 'Unknown job'}), 404
+            return jsonify(job)
+
         @self.app.route('/api/faultexplainer/frontend/start', methods=['POST'])
         def start_frontend():
             success, message = self.bridge.start_faultexplainer_frontend()
             # Handle form submissions by redirecting back to main page
-            if request.content_type and 'application/x-www-form-urlencoded' in request.content_type:
+            if request.mimetype == 'application/x-www-form-urlencoded':
                 return redirect(url_for('index'))
             return jsonify({'success': success, 'message': message})
 
@@ -2111,18 +3068,20 @@ class UnifiedControlPanel:
                     success, message = True, 'Bridge already running'
                 else:
                     # Get current TEP_control directory for venv and bridge script
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    venv_python = os.path.join(script_dir, '.venv','bin','python')
-                    bridge_script_dir = script_dir  # Bridge script is in TEP_control/backend/ subdirectory
-                    process = subprocess.Popen([venv_python, 'backend/tep_faultexplainer_bridge.py'],
-                                               cwd=bridge_script_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                    venv_python = self._venv_python
+                    bridge_script = os.path.join(self._backend_dir, 'tep_faultexplainer_bridge.py')
+                    # Output goes to a log file: an undrained PIPE would block the bridge
+                    # once ~64 KB of output filled the pipe buffer
+                    bridge_log = os.path.join(self._backend_dir, 'logs', 'tep_bridge.log')
+                    with open_child_log(bridge_log) as log_file:
+                        process = spawn_detached([venv_python, bridge_script], self._script_dir, log_file)
                     self.bridge.processes['tep_bridge'] = process
-                    success, message = True, 'Bridge started'
+                    success, message = True, f'Bridge started (logs: {bridge_log})'
             except Exception as e:
                 success, message = False, f'Bridge failed: {e}'
 
             # Handle form submissions by redirecting back to main page
-            if request.content_type and 'application/x-www-form-urlencoded' in request.content_type:
+            if request.mimetype == 'application/x-www-form-urlencoded':
                 return redirect(url_for('index'))
             return jsonify({'success': success, 'message': message})
 
@@ -2145,8 +3104,8 @@ class UnifiedControlPanel:
                     self.bridge.current_preset = payload['preset']
                     # Remove preset before forwarding
                     payload = {k:v for k,v in payload.items() if k!='preset'}
-                r = requests.post('http://127.0.0.1:8000/config/runtime', json=payload, timeout=5)
-                return jsonify(r.json()), r.status_code
+                r = self._backend_session.post('http://127.0.0.1:8000/config/runtime', json=payload, timeout=5)
+                return passthrough_response(r)
             except Exception as e:
                 return jsonify({'status':'error','error':str(e)}), 500
 
@@ -2155,30 +3114,31 @@ class UnifiedControlPanel:
             """Get independent LLM results for split display - Fixed for MultiLLM backend"""
             try:
                 # 🔧 FIX: Use MultiLLM backend's /explain endpoint instead of /independent/status
-                import requests
-
-                # Check if we have recent analysis results
-                if hasattr(self.bridge, 'last_llm_results') and self.bridge.last_llm_results:
-                    # Return cached results from recent analysis
-                    return jsonify(self.bridge.last_llm_results)
-
-                # If no cached results, return empty state
-                results = {
-                    'lmstudio': {
-                        'status': 'ready',
-                        'message': 'LMStudio ready - waiting for anomaly to trigger analysis',
-                        'timestamp': None,
-                        'analysis': None
-                    },
-                    'gemini': {
-                        'status': 'ready',
-                        'message': 'Gemini ready - waiting for anomaly to trigger analysis',
-                        'timestamp': None,
-                        'analysis': None
+
+                def build():
+                    # Check if we have recent analysis results
+                    if hasattr(self.bridge, 'last_llm_results') and self.bridge.last_llm_results:
+                        # Return cached results from recent analysis
+                        return self.bridge.last_llm_results
+
+                    # If no cached results, return empty state
+                    return {
+                        'lmstudio': {
+                            'status': 'ready',
+                            'message': 'LMStudio ready - waiting for anomaly to trigger analysis',
+                            'timestamp': None,
+                            'analysis': None
+                        },
+                        'gemini': {
+                            'status': 'ready',
+                            'message': 'Gemini ready - waiting for anomaly to trigger analysis',
+                            'timestamp': None,
+                            'analysis': None
+                        }
                     }
-                }
 
-                return jsonify(results)
+                # Body and ETag are computed once per TTL; unchanged results poll back as a bodyless 304
+                return self._cached_json('independent_llm_results', build, max_age=2)
 
             except Exception as e:
                 print(f"❌ Error getting independent LLM results: {str(e)}")
@@ -2192,27 +3152,38 @@ class UnifiedControlPanel:
         def proxy_backend_baseline_reload():
                 try:
                     # Load baseline data directly from local CSV file
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    baseline_path = os.path.join(script_dir, 'backend', 'data', 'normal_baseline.csv')
+                    baseline_path = self._baseline_path
 
                     if os.path.exists(baseline_path):
-                        import pandas as pd
-                        baseline_df = pd.read_csv(baseline_path)
-
-                        # Store baseline data for internal use
-                        self.baseline_data = baseline_df
-
-                        # Get feature count
-                        feature_count = len([col for col in baseline_df.columns if col != 'time'])
+                        st = os.stat(baseline_path)
+                        key = (st.st_mtime_ns, st.st_size)
+                        if key != self._baseline_key or self._baseline_summary is None:
+                            # Only re-parse when the CSV actually changed
+                            if pd is None:
+                                raise ImportError("pandas is required to load the baseline CSV")
+                            # Every baseline column is numeric: skip per-column type inference
+                            baseline_df = pd.read_csv(baseline_path, dtype=np.float64)
+
+                            # Store baseline data for internal use
+                            self.baseline_data = baseline_df
+                            self._baseline_key = key
+                            self._baseline_summary = {
+                                'samples': len(baseline_df),
+                                'features': len([col for col in baseline_df.columns if col != 'time']),
+                                'pressure_mean': float(baseline_df['Reactor Pressure'].mean()),
+                                'temp_mean': float(baseline_df['Reactor Temperature'].mean()),
+                            }
+                        summary = self._baseline_summary
+                        feature_count = summary['features']
 
-                        print(f"✅ Baseline loaded: {len(baseline_df)} samples, {feature_count} features")
-                        print(f"   Key values: Pressure={baseline_df['Reactor Pressure'].mean():.1f} kPa, Temp={baseline_df['Reactor Temperature'].mean():.1f}°C")
+                        print(f"✅ Baseline loaded: {summary['samples']} samples, {feature_count} features")
+                        print(f"   Key values: Pressure={summary['pressure_mean']:.1f} kPa, Temp={summary['temp_mean']:.1f}°C")
 
                         return jsonify({
                             'status': 'ok',
                             'features': feature_count,
-                            'samples': len(baseline_df),
-                            'message': f'Baseline loaded with {feature_count} features from {len(baseline_df)} samples'
+                            'samples': summary['samples'],
+                            'message': f"Baseline loaded with {feature_count} features from {summary['samples']} samples"
                         }), 200
                     else:
                         return jsonify({
@@ -2229,8 +3200,8 @@ class UnifiedControlPanel:
         def proxy_backend_alpha():
             try:
                 payload = request.get_json() or {}
-                r = requests.post('http://127.0.0.1:8000/config/alpha', json=payload, timeout=5)
-                return jsonify(r.json()), r.status_code
+                r = self._backend_session.post('http://127.0.0.1:8000/config/alpha', json=payload, timeout=5)
+                return passthrough_response(r)
             except Exception as e:
                 return jsonify({'status':'error','error':str(e)}), 500
 
@@ -2239,9 +3210,8 @@ class UnifiedControlPanel:
         def proxy_backend_analysis_history():
             try:
                 limit = request.args.get('limit', '5')
-                import requests
-                r = requests.get(f'http://127.0.0.1:8000/analysis/history?limit={limit}', timeout=10)
-                return jsonify(r.json()), r.status_code
+                r = self._backend_session.get(f'http://127.0.0.1:8000/analysis/history?limit={limit}', timeout=10)
+                return passthrough_response(r)
             except Exception as e:
                 return jsonify({'status':'error','error':str(e), 'message': 'Backend not reachable on port 8000. Make sure FaultExplainer backend is running.'}), 500
 
@@ -2249,10 +3219,10 @@ class UnifiedControlPanel:
         @self.app.route('/api/backend/analysis/download/<date>', methods=['GET'])
         def proxy_backend_analysis_download(date):
             try:
-                import requests
-                r = requests.get(f'http://127.0.0.1:8000/analysis/download/{date}', timeout=10)
-                # Return the response as-is (should be a file download)
-                return Response(r.content, status=r.status_code, headers=dict(r.headers))
+                r = self._backend_session.get(f'http://127.0.0.1:8000/analysis/download/{date}', timeout=10, stream=True)
+                # Forward the file download as it arrives instead of buffering it whole
+                return stream_passthrough_response(r, chunk_size=64 * 1024,
+                                                   keep_headers=('content-type', 'content-disposition'))
             except Exception as e:
                 return jsonify({'status':'error','error':str(e), 'message': f'Backend not reachable or file not found for date {date}'}), 500
 
@@ -2261,43 +3231,41 @@ class UnifiedControlPanel:
         def download_analysis_history(format):
             try:
                 limit = request.args.get('limit', '20')
-                import requests
-                r = requests.get(f'http://127.0.0.1:8000/analysis/history?limit={limit}', timeout=10)
+                r = self._backend_session.get(f'http://127.0.0.1:8000/analysis/history?limit={limit}', timeout=10)
                 data = r.json()
+                items = data.get('items', [])
 
-                if format == 'jsonl':
+                # Both formats are generated item by item and streamed, never joined into one string
+                def gen_jsonl():
                     # JSONL format - one JSON object per line
-                    import json
-                    lines = []
-                    for item in data.get('items', []):
-                        lines.append(json.dumps(item))
-                    content = '\n'.join(lines)
+                    for item in items:
+                        yield json_dumps_bytes(item) + b'\n'
+
+                def gen_md():
+                    # Markdown format; each block is separated by a blank line as before
+                    yield '# TEP Analysis History\n'.encode('utf-8')
+                    for i, item in enumerate(items, 1):
+                        ts = item.get('timestamp', 'Unknown time')
+                        parts = [f'## Analysis #{i} - {ts}\n',
+                                 f'**Feature Analysis:**\n```\n{item.get("feature_analysis", "N/A")}\n```\n']
+
+                        if 'performance_summary' in item:
+                            parts.append('**Performance Summary:**\n')
+                            for model, perf in item['performance_summary'].items():
+                                parts.append(f'- {model}: {perf.get("response_time", 0):.2f}s, {perf.get("word_count", 0)} words\n')
+                        parts.append('\n---\n')
+                        yield ''.join('\n' + part for part in parts).encode('utf-8')
 
-                    from flask import Response
+                if format == 'jsonl':
                     return Response(
-                        content,
+                        gen_jsonl(),
                         mimetype='application/jsonl',
                         headers={'Content-Disposition': f'attachment; filename=tep_analysis_history.jsonl'}
                     )
 
                 elif format == 'md':
-                    # Markdown format
-                    lines = ['# TEP Analysis History\n']
-                    for i, item in enumerate(data.get('items', []), 1):
-                        ts = item.get('timestamp', 'Unknown time')
-                        lines.append(f'## Analysis #{i} - {ts}\n')
-                        lines.append(f'**Feature Analysis:**\n```\n{item.get("feature_analysis", "N/A")}\n```\n')
-
-                        if 'performance_summary' in item:
-                            lines.append('**Performance Summary:**\n')
-                            for model, perf in item['performance_summary'].items():
-                                lines.append(f'- {model}: {perf.get("response_time", 0):.2f}s, {perf.get("word_count", 0)} words\n')
-                        lines.append('\n---\n')
-
-                    content = '\n'.join(lines)
-                    from flask import Response
                     return Response(
-                        content,
+                        gen_md(),
                         mimetype='text/markdown',
                         headers={'Content-Disposition': f'attachment; filename=tep_analysis_history.md'}
                     )
@@ -2330,25 +3298,9 @@ class UnifiedControlPanel:
                     print(f"Warning: Process stop error: {e}")
 
                 # Kill specific ports as backup
-                import subprocess
                 ports_to_kill = [8000, 5173, 9001]  # Don't kill 9002 (unified console itself)
-                for port in ports_to_kill:
-                    try:
-                        # Get PIDs listening on this port
-                        result = subprocess.run(['lsof', '-ti', f':{port}'],
-                                              capture_output=True, text=True, timeout=2)
-                        pids = result.stdout.strip().split('\n')
-
-                        # Kill each PID
-                        for pid in pids:
-                            if pid:  # Skip empty strings
-                                try:
-                                    subprocess.run(['kill', '-9', pid], timeout=2)
-                                    print(f"✅ Killed process {pid} on port {port}")
-                                except:
-                                    pass
-                    except:
-                        pass
+                for pid in self.bridge.kill_port_processes(ports_to_kill):
+                    print(f"✅ Killed process {pid} on ports {ports_to_kill}")
 
                 # 🔧 NEW: Kill TEP Bridge (was missing - caused overnight charges!)
                 try:
@@ -2374,16 +3326,12 @@ class UnifiedControlPanel:
         def open_analysis_folder():
             """Open the analysis_history folder in Finder/File Explorer"""
             try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                analysis_folder = os.path.join(script_dir, 'backend', 'diagnostics', 'analysis_history')
+                analysis_folder = self._history_dir
 
                 # Create folder if it doesn't exist
                 os.makedirs(analysis_folder, exist_ok=True)
 
                 # Open folder in Finder (macOS) or File Explorer (Windows/Linux)
-                import platform
-                import subprocess
-
                 system = platform.system()
                 if system == 'Darwin':  # macOS
                     subprocess.run(['open', analysis_folder])
@@ -2408,16 +3356,12 @@ class UnifiedControlPanel:
         def open_diagnostics_folder():
             """Open the diagnostics folder (where PDF reports are saved) in Finder/File Explorer"""
             try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                diagnostics_folder = os.path.join(script_dir, 'backend', 'diagnostics')
+                diagnostics_folder = self._diag_dir
 
                 # Create folder if it doesn't exist
                 os.makedirs(diagnostics_folder, exist_ok=True)
 
                 # Open folder in Finder (macOS) or File Explorer (Windows/Linux)
-                import platform
-                import subprocess
-
                 system = platform.system()
                 if system == 'Darwin':  # macOS
                     subprocess.run(['open', diagnostics_folder])
@@ -2442,40 +3386,14 @@ class UnifiedControlPanel:
         @self.app.route('/api/idv/explain/<int:idv_number>')
         def explain_idv(idv_number):
             """Explain what a specific IDV fault does physically."""
-            explanations = {
-                1: {
-                    "name": "A/C Feed Ratio Change (Stream 4)",
-                    "physical_meaning": "Changes the composition ratio of components A and C in the feed stream while keeping B constant",
-                    "what_happens": "Component A decreases by 3% (48.5% → 45.5%), Component C increases by 3% (51.0% → 54.0%)",
-                    "industrial_cause": "Feed preparation system malfunction, upstream process changes, feed tank mixing issues, or flow meter calibration drift",
-                    "expected_behavior": {
-                        "immediate": "Feed composition changes instantly (step change)",
-                        "reactor": "Reaction kinetics change due to different A/C ratio",
-                        "product": "Product quality affected - less A means lower conversion",
-                        "control": "Controllers detect composition change and try to compensate by adjusting flow rates"
-                    },
-                    "measurements_affected": {
-                        "primary": ["XMEAS(23-41): Composition measurements", "XMEAS(6): Reactor feed rate"],
-                        "secondary": ["XMEAS(9): Reactor temperature", "XMEAS(7): Reactor pressure"]
-                    },
-                    "operator_expectations": {
-                        "composition_analyzer": "Should show A component dropping from ~48.5% to ~45.5%",
-                        "reactor_temperature": "May increase slightly due to different reaction heat",
-                        "product_quality": "Product purity may decrease due to lower A conversion",
-                        "control_response": "Feed flow controllers will adjust to maintain production rate"
-                    },
-                    "detection_difficulty": "Easy (95-99% detection rate)",
-                    "severity": "Medium - affects product quality but process remains stable",
-                    "fortran_implementation": "XST(1,4) = TESUB8(1,TIME) - IDV(1)*0.03D0"
-                }
-            }
-
-            if idv_number in explanations:
-                return jsonify(explanations[idv_number])
+            body = IDV_EXPLANATIONS_JSON.get(idv_number)
+            if body is not None:
+                # Static content: serve the bytes encoded at import time
+                return Response(body, mimetype='application/json')
             else:
                 return jsonify({
                     "error": f"IDV_{idv_number} explanation not available yet",
-                    "available": list(explanations.keys())
+                    "available": list(IDV_EXPLANATIONS.keys())
                 }), 404
 
         # Three-tier control system API endpoints
@@ -2542,16 +3460,16 @@ class UnifiedControlPanel:
                 idv_equivalent = data.get('idv_equivalent')
                 intensity = data.get('intensity')
 
-                print(f"🧪 Composition adjustment: {component} in stream {stream} to {value}")
-                print(f"   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
+                # One ring entry per request (both lines), flushed off the request path
+                self._log_ring.append(
+                    f"🧪 Composition adjustment: {component} in stream {stream} to {value}"
+                    f"\n   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
 
                 # Map to IDV fault
-                if idv_equivalent == 1:  # A/C Feed Ratio
-                    self.bridge.set_idv(1, intensity)
-                elif idv_equivalent == 2:  # B Composition
-                    self.bridge.set_idv(2, intensity)
+                if idv_equivalent in self._COMPOSITION_IDVS:
+                    self.bridge.set_idv(idv_equivalent, intensity)
 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': f'{component} composition adjusted to {value*100:.1f}%',
                     'component': component,
@@ -2560,8 +3478,8 @@ class UnifiedControlPanel:
                 })
 
             except Exception as e:
-                print(f"❌ Composition adjustment error: {e}")
-                return jsonify({'success': False, 'message': str(e)}), 500
+                self._log_ring.append(f"❌ Composition adjustment error: {e}")
+                return json_response({'success': False, 'message': str(e)}, 500)
 
         @self.app.route('/api/process/temperature', methods=['POST'])
         def adjust_temperature():
@@ -2573,16 +3491,16 @@ class UnifiedControlPanel:
                 idv_equivalent = data.get('idv_equivalent')
                 intensity = data.get('intensity')
 
-                print(f"🌡️ Temperature adjustment: {system} to {value}°C")
-                print(f"   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
+                # One ring entry per request (both lines), flushed off the request path
+                self._log_ring.append(
+                    f"🌡️ Temperature adjustment: {system} to {value}°C"
+                    f"\n   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
 
                 # Map to IDV fault
-                if idv_equivalent == 4:  # Reactor cooling water
-                    self.bridge.set_idv(4, intensity)
-                elif idv_equivalent == 5:  # Condenser cooling water
-                    self.bridge.set_idv(5, intensity)
+                if idv_equivalent in self._TEMPERATURE_IDVS:
+                    self.bridge.set_idv(idv_equivalent, intensity)
 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': f'{system} temperature adjusted to {value}°C',
                     'system': system,
@@ -2591,8 +3509,8 @@ class UnifiedControlPanel:
                 })
 
             except Exception as e:
-                print(f"❌ Temperature adjustment error: {e}")
-                return jsonify({'success': False, 'message': str(e)}), 500
+                self._log_ring.append(f"❌ Temperature adjustment error: {e}")
+                return json_response({'success': False, 'message': str(e)}, 500)
 
         @self.app.route('/api/process/flow', methods=['POST'])
         def adjust_flow():
@@ -2604,16 +3522,16 @@ class UnifiedControlPanel:
                 idv_equivalent = data.get('idv_equivalent')
                 intensity = data.get('intensity')
 
-                print(f"💧 Flow adjustment: {component} availability to {availability}%")
-                print(f"   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
+                # One ring entry per request (both lines), flushed off the request path
+                self._log_ring.append(
+                    f"💧 Flow adjustment: {component} availability to {availability}%"
+                    f"\n   Equivalent to IDV_{idv_equivalent} with intensity {intensity}")
 
                 # Map to IDV fault
-                if idv_equivalent == 6:  # A Feed Loss
-                    self.bridge.set_idv(6, intensity)
-                elif idv_equivalent == 7:  # C Header Pressure Loss
-                    self.bridge.set_idv(7, intensity)
+                if idv_equivalent in self._FLOW_IDVS:
+                    self.bridge.set_idv(idv_equivalent, intensity)
 
-                return jsonify({
+                return json_response({
                     'success': True,
                     'message': f'{component} feed availability set to {availability}%',
                     'component': component,
@@ -2622,108 +3540,292 @@ class UnifiedControlPanel:
                 })
 
             except Exception as e:
-                print(f"❌ Flow adjustment error: {e}")
-                return jsonify({'success': False, 'message': str(e)}), 500
+                self._log_ring.append(f"❌ Flow adjustment error: {e}")
+                return json_response({'success': False, 'message': str(e)}, 500)
 
         # Model control proxy endpoints
         @self.app.route('/api/models/status', methods=['GET'])
         def proxy_models_status():
+            def fetch():
+                # Pooled keep-alive session; fail fast on connect, allow slow replies
+                r = self._models_session.get('http://127.0.0.1:8000/models/status', timeout=(1, 10))
+                # Cache the backend's bytes as-is; no decode/re-encode per poll
+                return r.content, r.status_code, r.headers.get('Content-Type', 'application/json')
+
             try:
-                import requests
-                r = requests.get('http://127.0.0.1:8000/models/status', timeout=10)
-                return jsonify(r.json()), r.status_code
+                # The UI polls this; reuse the backend's answer for MODELS_STATUS_TTL seconds
+                body, status, content_type = self._cached('models_status', fetch, MODELS_STATUS_TTL)
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
+            return Response(body, status=status, content_type=content_type)
 
         @self.app.route('/api/models/toggle', methods=['POST'])
         def proxy_models_toggle():
             try:
                 payload = request.get_json() or {}
-                import requests
-                r = requests.post('http://127.0.0.1:8000/models/toggle', json=payload, timeout=10)
-                return jsonify(r.json()), r.status_code
+                r = self._models_session.post('http://127.0.0.1:8000/models/toggle', json=payload,
+                                               timeout=(1, 10), stream=True)
+                if r.ok:
+                    # Next status poll must see the toggled state
+                    self._response_cache.pop('models_status', None)
+                return stream_passthrough_response(r)
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
 
     def cleanup_on_exit(self):
-        """Cleanup all processes when GUI is closed."""
+        """Cleanup all processes when GUI is closed.
+        Runs from signal handlers and atexit, so it must not rely on ThreadPoolExecutor
+        (it refuses new work once the interpreter starts shutting down).
+        """
         print("\n🧹 GUI closed - cleaning up all processes...")
+        if self._browser_timer is not None:
+            self._browser_timer.cancel()
+
+        # Each step reports its own failure and never skips the ones after it
+        failed = False
         try:
             # Stop all managed processes
             self.bridge.stop_all_processes()
+        except Exception as e:
+            print(f"⚠️ Could not stop managed processes: {e}")
+            failed = True
 
-            # Kill processes by port for comprehensive cleanup
-            ports_to_clean = [9001, 8000, 5173, 1234]  # Control panel, backend, frontend, LMStudio
-            for port in ports_to_clean:
-                try:
-                    if self.bridge.kill_port_process(port):
-                        print(f"🔪 Freed port {port}")
-                except Exception as e:
-                    print(f"⚠️ Could not clean port {port}: {e}")
+        try:
+            # Don't lose renames still waiting for the batched fsync
+            self._sync_renames()
+        except Exception as e:
+            print(f"⚠️ Could not sync pending renames: {e}")
+            failed = True
 
+        # Kill processes by port for comprehensive cleanup
+        ports_to_clean = [9001, 8000, 5173, 1234]  # Control panel, backend, frontend, LMStudio
+        results = {}
+
+        def clean_port(port):
+            try:
+                results[port] = (self.bridge.kill_port_process(port), None)
+            except Exception as e:
+                results[port] = (False, e)
+
+        # All ports at once: shutdown waits only for the slowest lookup/kill (plain threads
+        # can still be started from an atexit hook, unlike executor workers)
+        workers = [threading.Thread(target=clean_port, args=(port,), daemon=True) for port in ports_to_clean]
+        for worker in workers:
+            worker.start()
+        deadline = time.monotonic() + 10
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+        for port in ports_to_clean:
+            if port not in results:
+                print(f"⚠️ Port {port} cleanup still running after 10s - giving up on it")
+                failed = True
+                continue
+            freed, error = results[port]
+            if error is not None:
+                print(f"⚠️ Could not clean port {port}: {error}")
+                failed = True
+            elif freed:
+                print(f"🔪 Freed port {port}")
+
+        if failed:
+            print("⚠️ Cleanup finished with errors (see above)")
+        else:
             print("✅ Cleanup completed - all services stopped")
-        except Exception as e:
-            print(f"⚠️ Cleanup error: {e}")
+
+    def _handle_shutdown_signal(self, signum):
+        """Run cleanup for the first termination signal. Returns False if shutdown already started."""
+        # A second Ctrl+C or SIGHUP+SIGTERM on terminal close must not start another cleanup
+        if self._shutting_down.is_set():
+            return False
+        self._shutting_down.set()
+        print(f"\n🛑 Received signal {signum} - shutting down gracefully...")
+        self._cleanup_once()
+        return True
+
+    def _cleanup_once(self):
+        """Run cleanup_on_exit at most once per process (signal path and atexit both land here)."""
+        with self._cleanup_lock:
+            if self._cleaned:
+                return
+            self._cleaned = True
+        self.cleanup_on_exit()
+
+    def _signal_forward_loop(self, sock):
+        """Dedicated signal thread: Python's C-level handler writes each signal number into
+        the wakeup socket; the shutdown for the first termination signal runs here."""
+        while True:
+            data = sock.recv(64)
+            if not data:
+                return
+            for signum in data:
+                if signum in SHUTDOWN_SIGNALS and self._handle_shutdown_signal(signum):
+                    os._exit(0)
 
     def setup_signal_handlers(self):
-        """Setup signal handlers for graceful shutdown."""
-        def signal_handler(signum, frame):
-            print(f"\n🛑 Received signal {signum} - shutting down gracefully...")
-            self.cleanup_on_exit()
-            sys.exit(0)
+        """Setup signal handling for graceful shutdown (call from the main thread).
 
-        # Handle common termination signals
-        signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
-        signal.signal(signal.SIGTERM, signal_handler)  # Termination request
+        Cleanup runs on a dedicated 'tep-signals' thread fed by signal.set_wakeup_fd,
+        so it never runs inside whatever the main thread happens to be executing.
+        Signals are deliberately not blocked with pthread_sigmask: threads inherit the
+        mask, and so would every child they Popen/posix_spawn, leaving SIGTERM
+        ineffective on them.
+        """
+        wakeup = None
+        try:
+            wakeup = socket.socketpair()
+            wakeup[1].setblocking(False)
+            signal.set_wakeup_fd(wakeup[1].fileno(), warn_on_full_buffer=False)
+        except (AttributeError, OSError, ValueError) as e:
+            print(f"⚠️ Signal forwarding thread unavailable ({e}) - handling signals on the main thread")
+            wakeup = None
+        self._signal_wakeup = wakeup  # keep both socket ends alive
 
-        # On macOS/Unix, also handle window close
+        def signal_handler(signum, frame):
+            if wakeup is not None:
+                return  # The forwarding thread got the same signal number and handles it
+            # Cleanup already ran; os._exit skips atexit and any finally blocks up the stack
+            if self._handle_shutdown_signal(signum):
+                os._exit(0)
+
+        # Installing a Python handler is what makes the interpreter forward the signal
+        # to the wakeup socket; SIGHUP is included where it exists
+        for sig in SHUTDOWN_SIGNALS:
+            signal.signal(sig, signal_handler)
+
+        if wakeup is not None:
+            threading.Thread(target=self._signal_forward_loop, args=(wakeup[0],),
+                             name='tep-signals', daemon=True).start()
+
+        # A closed browser tab must only fail that one write (EPIPE), never kill the server.
+        # CPython ignores SIGPIPE by default; pin it in case an embedding host reset it.
         try:
-            signal.signal(signal.SIGHUP, signal_handler)   # Terminal hangup
-        except AttributeError:
+            signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+        except (AttributeError, ValueError):
             pass  # Not available on Windows
 
-    def run(self, host='0.0.0.0', port=9002, debug=False):
+    def run(self, host='0.0.0.0', port=9002, debug=False, server='waitress'):
         """Run the control panel.
         If port is already in use by an older instance, kill it first to avoid duplicates.
+        server='waitress' (default, threaded production server) or 'flask' (Werkzeug dev server).
+        With TEP_BEHIND_PROXY set (e.g. nginx in front, see deploy/nginx.conf) the panel binds
+        to 127.0.0.1 only and does not open a browser.
         """
+        behind_proxy = bool(os.environ.get('TEP_BEHIND_PROXY'))
+        if behind_proxy:
+            host = '127.0.0.1'
         print(f"🚀 Starting Unified TEP Control Panel on http://localhost:{port}")
         print("✅ Single interface for all components")
         print("✅ Proper data flow: TEP → FaultExplainer")
         print("✅ Correct timing and values")
         print("✅ Auto-cleanup on GUI close enabled")
 
-        # Setup signal handlers for graceful shutdown
+        # Fold pending snapshot renames into the history before the backend starts appending
+        try:
+            self._compact_renames()
+        except Exception as e:
+            print(f"⚠️ Could not compact snapshot renames: {e}")
+
+        # Setup signal handlers for graceful shutdown; atexit covers exits that bypass run()'s finally
         self.setup_signal_handlers()
+        atexit.register(self._cleanup_once)
 
         # Proactively free port 9001 from any stale processes before starting
         try:
             if self.bridge.kill_port_process(port):
                 print(f"🔪 Freed port {port} from stale process")
+                # Wait only as long as the OS actually takes to release it
+                if not wait_port_free(host, port):
+                    print(f"⚠️ Port {port} still busy after 500ms - starting anyway")
         except Exception as e:
             print(f"⚠️ Could not pre-free port {port}: {e}")
-        time.sleep(0.5)
 
-        # Auto-open browser after a short delay
-        import threading
-        import webbrowser
+        # Auto-open browser after a short delay (not when a reverse proxy fronts the panel)
         def open_browser():
-            time.sleep(2)  # Wait for server to start
             url = f"http://127.0.0.1:{port}"
             print(f"🌐 Auto-opening browser: {url}")
             webbrowser.open(url)
 
-        browser_thread = threading.Thread(target=open_browser)
-        browser_thread.daemon = True
-        browser_thread.start()
+        if not behind_proxy:
+            # One-shot timer (2s for the server to start); cleanup_on_exit cancels it
+            # so a fast-failing startup never pops a browser afterwards
+            self._browser_timer = threading.Timer(2.0, open_browser)
+            self._browser_timer.daemon = True
+            self._browser_timer.start()
+
+        if server == 'waitress':
+            try:
+                from waitress import serve
+            except ImportError:
+                print("⚠️ waitress not installed - falling back to the Flask development server")
+                server = 'flask'
 
         try:
-            self.app.run(host=host, port=port, debug=debug)
+            if server == 'waitress':
+                # Worker threads serve polling, SSE and slow proxy calls concurrently
+                print(f"🍸 Serving with waitress ({WSGI_THREADS} threads)")
+                serve(self.app, sockets=[make_listen_socket(host, port)], threads=WSGI_THREADS)
+            elif debug:
+                # Debugger only: the reloader would re-exec this script in a child that runs
+                # the stale-port cleanup above against its own parent
+                self.app.run(host=host, port=port, debug=debug, use_reloader=False, threaded=True)
+            else:
+                from werkzeug.serving import make_server
+                sock = make_listen_socket(host, port)
+                make_server(host, port, self.app, threaded=True, fd=sock.fileno()).serve_forever()
         except KeyboardInterrupt:
             print("\n🛑 Keyboard interrupt received")
         finally:
-            self.cleanup_on_exit()
+            # Clean up while the interpreter is fully alive (serve() returned or raised);
+            # the atexit hook is only a backstop and _cleanup_once makes it a no-op here
+            self._cleanup_once()
+
+
+# The panel owns the simulation, SSE ring and child processes, so one process
+# must serve it: external WSGI servers need a single worker (threads are fine).
+_panel = None
+
+
+_panel_lock = threading.Lock()
+
+
+def create_app():
+    """Build the control panel once and return its Flask app (for external WSGI servers).
+    Also registers the exit cleanup that run() would otherwise install (gunicorn path).
+    """
+    global _panel
+    if _panel is None:
+        with _panel_lock:
+            # Concurrent first requests on a threaded worker must not build two panels
+            if _panel is None:
+                panel = UnifiedControlPanel()
+                # gunicorn stops workers with SIGTERM and exits them normally, so atexit runs
+                atexit.register(panel._cleanup_once)
+                _panel = panel
+    return _panel.app
+
+
+def app(environ, start_response):
+    """Module-level WSGI entry point (e.g. `gunicorn unified_console:app`); builds the panel on first request."""
+    return create_app()(environ, start_response)
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Unified TEP Control Panel")
+    parser.add_argument('--server', choices=['waitress', 'gunicorn', 'flask'], default='waitress',
+                        help="WSGI server (default: waitress; gunicorn is POSIX only)")
+    parser.add_argument('--port', type=int, default=9002)
+    args = parser.parse_args()
+
+    if args.server == 'gunicorn':
+        # Replace this process with gunicorn: one worker (state is in-process), threaded
+        os.execvp('gunicorn', [
+            'gunicorn', '-w', '1', '-k', 'gthread', '--threads', str(WSGI_THREADS),
+            '--timeout', '0',
+            '-b', f"{'127.0.0.1' if os.environ.get('TEP_BEHIND_PROXY') else '0.0.0.0'}:{args.port}",
+            'unified_console:app'
+        ])
+
     panel = UnifiedControlPanel()
-    panel.run(debug=False)
+    panel.run(port=args.port, debug=False, server=args.server)